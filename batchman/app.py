@@ -6,7 +6,7 @@ from typing import Iterable
 import yaml
 from textual.app import App, ComposeResult, SystemCommand
 from textual.command import CommandPalette
-from textual.containers import HorizontalGroup, VerticalScroll
+from textual.containers import HorizontalGroup, Vertical, VerticalScroll
 from textual.screen import Screen
 from textual.widgets import Footer, Header, Rule
 
@@ -16,9 +16,12 @@ from batchman.command_providers import (
     SelectJobQueueCommand,
     SelectRegionCommand,
 )
-from batchman.lib.batch import get_batch_client
+from batchman.lib.batch import get_batch_client, get_logs_client
+from batchman.lib.instrumentation import metrics
+from batchman.widgets.debug_panel import DebugPanel
 from batchman.widgets.job_filter import JobFilter
 from batchman.widgets.job_table import JobTable
+from batchman.widgets.queue_stats import QueueStatsPanel
 
 CONFIG_LOCATION = pathlib.Path.home() / ".batchman.yml"
 
@@ -29,6 +32,10 @@ class Config:
     region: str | None = "eu-west-1"
     theme: str | None = "textual-light"
     display_filter: bool = True
+    display_stats: bool = True
+    display_debug: bool = False
+    trace_file: str | None = None
+    time_window: str = "all"  # initial creation time filter, see `batchman.widgets.job_filter.TIME_WINDOWS`
 
     @classmethod
     def load(cls) -> "Config":
@@ -51,11 +58,16 @@ class BatchmanApp(App):
         ("c", "clone_selected", "Clone selected jobs"),
         ("d", "view_details", "View job details"),
         ("e", "toggle_expand_array_job", "Toggle array job expansion"),
+        ("f", "export_jobs", "Export jobs to a file"),
+        ("g", "search_logs", "Search logs of selected jobs"),
+        ("i", "invert_selection", "Invert selection"),
         ("k", "kill_selected", "Kill selected jobs"),
         ("l", "view_logs", "View job logs"),
         ("q", "quit", "Quit"),
         ("r", "refresh", "Refresh"),
         ("space", "toggle_selection", "Toggle selection"),
+        ("t", "triage_failures", "Triage failed jobs"),
+        ("v", "select_range", "Select range"),
         ("x", "clear_selection", "Clear selection"),
     ]
 
@@ -63,15 +75,24 @@ class BatchmanApp(App):
 
     CSS_PATH = "batchman.tcss"
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, config: Config | None = None, **kwargs):
         super().__init__(*args, **kwargs)
         self.AUTO_FOCUS = "JobTable"
 
-        self.config = Config.load()
+        if config is None:
+            # only persist the config when it comes from the user's config file
+            config = Config.load()
+            atexit.register(config.save)
+
+        self.config = config
         self.theme = self.config.theme
-        atexit.register(self.config.save)
 
+        self.connect()
+
+    def connect(self):
+        """Create the AWS clients for the configured region."""
         self.batch_client = get_batch_client(self.config.region)
+        self.logs_client = get_logs_client(self.config.region)
 
     def get_system_commands(self, screen: Screen) -> Iterable[SystemCommand]:
         yield from super().get_system_commands(screen)
@@ -90,29 +111,54 @@ class BatchmanApp(App):
             "Toggle filter visibility",
             self.action_toggle_filter,
         )
+        yield SystemCommand(
+            "Toggle stats",
+            "Toggle queue statistics visibility",
+            self.action_toggle_stats,
+        )
+        yield SystemCommand(
+            "Toggle debug panel",
+            "Show AWS call and table rendering metrics",
+            self.action_toggle_debug,
+        )
 
     def compose(self) -> ComposeResult:
         yield Header()
         with HorizontalGroup():
             with VerticalScroll():
-                yield JobTable()
+                job_table = JobTable()
+                yield job_table
             yield Rule(orientation="vertical", line_style="heavy")
-            yield JobFilter()
+            with Vertical(id="sidebar"):
+                yield JobFilter(time_window=self.config.time_window)
+                yield QueueStatsPanel(job_table.stats)
+        yield DebugPanel()
         yield Footer()
 
+    def update_sidebar(self):
+        """Hide the sidebar when none of its panels are shown."""
+        self.query_one("#sidebar").display = self.config.display_filter or self.config.display_stats
+
+    def update_instrumentation(self):
+        """Only collect metrics while somebody is looking at them."""
+        if self.config.display_debug or self.config.trace_file:
+            metrics.enable(trace_path=self.config.trace_file)
+        else:
+            metrics.disable()
+
     def update_header(self):
         self.title = f"Batchman - {self.config.job_queue_name} ({self.config.region})"
 
     def set_job_queue(self, job_queue: str):
         self.config.job_queue_name = job_queue
         self.update_header()
-        self.query_one(JobTable).refresh_jobs()
+        self.query_one(JobTable).refresh_jobs(new_source=True)
 
     def set_region(self, region: str):
         self.config.region = region
-        self.batch_client = get_batch_client(self.config.region)
+        self.connect()
         self.update_header()
-        self.query_one(JobTable).refresh_jobs()
+        self.query_one(JobTable).refresh_jobs(new_source=True)
 
     #
     # Event handlers
@@ -122,10 +168,17 @@ class BatchmanApp(App):
         self.theme_changed_signal.subscribe(self, self.on_theme_changed)
         try:
             self.query_one(JobFilter).display = self.config.display_filter
+            self.query_one(QueueStatsPanel).display = self.config.display_stats
+            self.update_sidebar()
         except:
             ...
+        self.query_one(DebugPanel).display = self.config.display_debug
+        if self.config.display_debug or self.config.trace_file:
+            self.update_instrumentation()
 
     def on_job_filter_changed(self, message: JobFilter.Changed):
+        if message.filter_settings.time_window != "custom":
+            self.config.time_window = message.filter_settings.time_window
         self.query_one(JobTable).update_filter_settings(message.filter_settings)
 
     def on_theme_changed(self, signal):
@@ -149,6 +202,12 @@ class BatchmanApp(App):
     def action_toggle_selection(self) -> None:
         self.query_one(JobTable).toggle_selected()
 
+    def action_select_range(self) -> None:
+        self.query_one(JobTable).select_range()
+
+    def action_invert_selection(self) -> None:
+        self.query_one(JobTable).invert_selection()
+
     def action_toggle_expand_array_job(self) -> None:
         self.query_one(JobTable).toggle_expand_array_job()
 
@@ -167,6 +226,15 @@ class BatchmanApp(App):
     def action_clone_selected(self) -> None:
         self.query_one(JobTable).clone_selected_jobs()
 
+    def action_search_logs(self) -> None:
+        self.query_one(JobTable).search_selected_logs()
+
+    def action_triage_failures(self) -> None:
+        self.query_one(JobTable).triage_failures()
+
+    def action_export_jobs(self) -> None:
+        self.query_one(JobTable).export_jobs()
+
     def action_quit(self) -> None:
         self.exit()
 
@@ -174,3 +242,18 @@ class BatchmanApp(App):
         job_filter = self.query_one(JobFilter)
         job_filter.display = not job_filter.display
         self.config.display_filter = job_filter.display
+        self.update_sidebar()
+
+    def action_toggle_stats(self) -> None:
+        stats_panel = self.query_one(QueueStatsPanel)
+        stats_panel.display = not stats_panel.display
+        self.config.display_stats = stats_panel.display
+        self.update_sidebar()
+        stats_panel.update_stats()
+
+    def action_toggle_debug(self) -> None:
+        debug_panel = self.query_one(DebugPanel)
+        debug_panel.display = not debug_panel.display
+        self.config.display_debug = debug_panel.display
+        self.update_instrumentation()
+        debug_panel.update_metrics()
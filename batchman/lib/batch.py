@@ -1,9 +1,21 @@
 import itertools
+import time
 
 import boto3
 import botocore.exceptions
 from joblib import Parallel, delayed
 
+from batchman.lib.instrumentation import metrics
+from batchman.lib.throttling import (
+    MAX_ATTEMPTS,
+    MAX_CONCURRENCY,
+    backoff_delay,
+    get_rate_limiter,
+)
+
+ARRAY_JOB_STATUSES = ["SUCCEEDED", "FAILED", "RUNNABLE", "RUNNING", "PENDING", "STARTING", "SUBMITTED"]
+THROTTLING_ERROR_CODES = {"TooManyRequestsException", "ThrottlingException", "Throttling", "RequestLimitExceeded"}
+
 
 class UnauthorizedError(Exception): ...
 
@@ -39,17 +51,61 @@ def flatten(lst: list[list]) -> list:
     return list(itertools.chain.from_iterable(lst))
 
 
+def call_aws(client: boto3.client, operation_name: str, **kwargs) -> dict:
+    """Call an AWS API operation through the rate limiter shared by all calls to the service.
+
+    Throttled calls are retried with jittered exponential backoff. Latency, errors and retries are recorded when
+    instrumentation is enabled.
+    """
+    service = client.meta.service_model.service_name
+    limiter = get_rate_limiter(service)
+    name = f"aws.{service}.{operation_name}"
+
+    for attempt in range(MAX_ATTEMPTS):
+        with limiter.slot():
+            start = time.perf_counter()
+            try:
+                response = getattr(client, operation_name)(**kwargs)
+            except botocore.exceptions.ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                metrics.increment(f"{name}.errors")
+                metrics.observe(name, time.perf_counter() - start, error=code)
+                if code not in THROTTLING_ERROR_CODES or attempt == MAX_ATTEMPTS - 1:
+                    raise
+            else:
+                # botocore retries some errors on its own; treat those as a sign of congestion too
+                retries = response.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+                if retries:
+                    limiter.on_throttled()
+                    metrics.increment("aws.retries", retries)
+                else:
+                    limiter.on_success()
+                metrics.increment(f"{name}.calls")
+                metrics.observe(name, time.perf_counter() - start, retries=retries)
+                return response
+
+        # throttled: back off (outside of the concurrency slot) and try again
+        limiter.on_throttled()
+        metrics.increment("aws.throttled")
+        time.sleep(backoff_delay(attempt))
+
+
 def get_batch_client(region: str):
     return boto3.client("batch", region_name=region)
 
 
-def get_log_events(log_stream_name: str):
-    client = boto3.client("logs")
+def get_logs_client(region: str):
+    return boto3.client("logs", region_name=region)
+
+
+def get_log_events(client: boto3.client, log_stream_name: str):
     next_token = None
 
     while True:
         extra_args = {"nextToken": next_token} if next_token else {"startFromHead": True}
-        reponse = client.get_log_events(
+        reponse = call_aws(
+            client,
+            "get_log_events",
             logGroupName="/aws/batch/job",
             logStreamName=log_stream_name,
             **extra_args,
@@ -69,35 +125,121 @@ def get_log_stream_name(job_details: dict) -> str | None:
 
 
 def get_array_child_jobs(client: boto3.client, parent_job: dict | None = None):
-    all_states = ["SUCCEEDED", "FAILED", "RUNNABLE", "RUNNING", "PENDING", "STARTING"]
-    for status in all_states:
+    for status in ARRAY_JOB_STATUSES:
         query_params = {"arrayJobId": parent_job["jobArn"], "jobStatus": status}
         yield from execute_paginated_job_query(client, query_params)
 
 
-def kill_jobs(client: boto3.client, job_ids: list[str], reason: str = "Killed by Batchman user"):
-    for job_id in job_ids:
+def get_array_status_summary(client: boto3.client, parent_job: dict) -> dict[str, int]:
+    """Number of children of an array job in each status.
+
+    Uses the summary already present in the job (job details carry it, job summaries from `list_jobs` don't),
+    otherwise fetches it with a single `describe_jobs` call.
+    """
+    status_summary = parent_job.get("arrayProperties", {}).get("statusSummary")
+    if status_summary is None:
+        job_details = get_jobs_details(client, [parent_job["jobArn"]])[0]
+        status_summary = job_details["arrayProperties"]["statusSummary"]
+
+    return {status: status_summary.get(status, 0) for status in ARRAY_JOB_STATUSES}
+
+
+def get_array_child_jobs_page(
+    client: boto3.client, parent_job: dict, status: str, page_size: int, next_token: str | None = None
+) -> tuple[list[dict], str | None]:
+    """Fetch one page of children of an array job with the given status.
+
+    Returns:
+        The child jobs and the token of the next page (None if this was the last page).
+    """
+    query_params = {"arrayJobId": parent_job["jobArn"], "jobStatus": status, "maxResults": page_size}
+    if next_token:
+        query_params["nextToken"] = next_token
+
+    try:
+        response = call_aws(client, "list_jobs", **query_params)
+    except botocore.exceptions.UnauthorizedSSOTokenError:
+        raise UnauthorizedError()
+
+    metrics.increment("aws.batch.list_jobs.jobs", len(response["jobSummaryList"]))
+    return response["jobSummaryList"], response.get("nextToken")
+
+
+def kill_job(client: boto3.client, job_id: str, reason: str) -> str | None:
+    """Kill a job, returning the error message if it fails."""
+    try:
         # we try both cancel_job and terminate_job because we want to be sure
-        client.cancel_job(jobId=job_id, reason=reason)
-        client.terminate_job(jobId=job_id, reason=reason)
+        call_aws(client, "cancel_job", jobId=job_id, reason=reason)
+        call_aws(client, "terminate_job", jobId=job_id, reason=reason)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def kill_jobs(client: boto3.client, job_ids: list[str], reason: str = "Killed by Batchman user") -> dict[str, str]:
+    """Kill jobs concurrently (within the rate limits).
+
+    Returns:
+        Error messages of the jobs which could not be killed, by job ID.
+    """
+    errors = Parallel(n_jobs=max(1, min(MAX_CONCURRENCY, len(job_ids))), prefer="threads")(
+        delayed(kill_job)(client, job_id, reason) for job_id in job_ids
+    )
+    return {job_id: error for job_id, error in zip(job_ids, errors) if error is not None}
+
+
+def get_jobs(
+    client: boto3.client, queue_name: str, created_after: int | None = None, created_before: int | None = None
+):
+    for page in get_job_pages(client, queue_name, created_after, created_before):
+        yield from page
 
 
-def get_jobs(client: boto3.client, queue_name: str):
-    query_params = {"jobQueue": queue_name, "filters": [{"name": "AFTER_CREATED_AT", "values": ["0"]}]}
-    yield from execute_paginated_job_query(client, query_params)
+def get_job_pages(
+    client: boto3.client, queue_name: str, created_after: int | None = None, created_before: int | None = None
+):
+    """Yield the jobs of a queue one `list_jobs` page at a time.
+
+    Args:
+        client: AWS Batch client
+        queue_name: job queue
+        created_after: only list jobs created at or after this time (in ms since epoch)
+        created_before: only list jobs created before this time (in ms since epoch); `list_jobs` accepts a single
+            filter, so this can't be combined with `created_after`
+    """
+    if created_after is not None and created_before is not None:
+        raise ValueError("Only one of created_after and created_before can be used")
+
+    if created_before is not None:
+        job_filter = {"name": "BEFORE_CREATED_AT", "values": [str(created_before)]}
+    else:
+        # the filter is exclusive; with any filter, jobs of all statuses are listed
+        job_filter = {"name": "AFTER_CREATED_AT", "values": [str(max(0, (created_after or 0) - 1))]}
+
+    query_params = {"jobQueue": queue_name, "filters": [job_filter]}
+    yield from execute_paginated_job_query_pages(client, query_params)
 
 
 def execute_paginated_job_query(client: boto3.client, query_params: dict):
+    for page in execute_paginated_job_query_pages(client, query_params):
+        yield from page
+
+
+def execute_paginated_job_query_pages(client: boto3.client, query_params: dict):
+    """Yield the job summaries of a `list_jobs` query page by page.
+
+    The next page is only requested once the consumer asks for it, so stopping the iteration stops the pagination.
+    """
     while True:
         try:
-            response = client.list_jobs(**query_params)
+            response = call_aws(client, "list_jobs", **query_params)
         except botocore.exceptions.UnauthorizedSSOTokenError:
             raise UnauthorizedError()
         except Exception:
             raise  # explicit re-raise
 
-        for job in response["jobSummaryList"]:
-            yield job
+        metrics.increment("aws.batch.list_jobs.jobs", len(response["jobSummaryList"]))
+        yield response["jobSummaryList"]
 
         if "nextToken" in response:
             query_params["nextToken"] = response["nextToken"]
@@ -107,8 +249,9 @@ def execute_paginated_job_query(client: boto3.client, query_params: dict):
 
 def get_jobs_details(client: boto3.client, job_arns: list[str]) -> list[dict]:
     # fetch details in parallel
-    jobs_details = Parallel()(
-        delayed(client.describe_jobs)(jobs=batch) for batch in batches((j for j in job_arns), 100)
+    job_batches = list(batches((j for j in job_arns), 100))
+    jobs_details = Parallel(n_jobs=max(1, min(MAX_CONCURRENCY, len(job_batches))), prefer="threads")(
+        delayed(call_aws)(client, "describe_jobs", jobs=batch) for batch in job_batches
     )
 
     jobs_details = flatten([response["jobs"] for response in jobs_details])
@@ -116,7 +259,7 @@ def get_jobs_details(client: boto3.client, job_arns: list[str]) -> list[dict]:
 
 
 def get_job_queues(client: boto3.client) -> list[dict]:
-    return client.describe_job_queues()["jobQueues"]
+    return call_aws(client, "describe_job_queues")["jobQueues"]
 
 
 def get_job_queue_names(client: boto3.client) -> list[str]:
@@ -125,4 +268,4 @@ def get_job_queue_names(client: boto3.client) -> list[str]:
 
 def get_region_names() -> list[str]:
     client = boto3.client("ec2")
-    return [region["RegionName"] for region in client.describe_regions()["Regions"]]
+    return [region["RegionName"] for region in call_aws(client, "describe_regions")["Regions"]]
@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator
+
+import boto3
+
+from batchman.lib.batch import get_log_events
+
+# details of jobs in these states don't change anymore
+FINAL_STATUSES = {"SUCCEEDED", "FAILED"}
+# details of jobs which are still in progress are refetched after this many seconds
+DETAILS_TTL_S = 15.0
+# total number of log lines kept in memory, logs longer than a quarter of this aren't cached at all
+LOG_CACHE_MAX_LINES = 1_000_000
+
+
+class JobDetailsCache:
+    """Bounded LRU cache of `describe_jobs` results keyed by job ARN.
+
+    Details of finished jobs are kept until evicted, details of jobs in progress expire after `ttl` seconds. The cache
+    also tracks which jobs are being fetched, so concurrent prefetches don't request the same jobs twice.
+    """
+
+    def __init__(self, max_size: int, ttl: float = DETAILS_TTL_S):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()  # job ARN -> (details, expiry)
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, job_arn: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(job_arn)
+            if entry is None:
+                return None
+
+            details, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[job_arn]
+                return None
+
+            self._entries.move_to_end(job_arn)
+            return details
+
+    def put_many(self, jobs_details: list[dict]):
+        now = time.monotonic()
+        with self._lock:
+            for details in jobs_details:
+                expires_at = float("inf") if details["status"] in FINAL_STATUSES else now + self.ttl
+                self._entries[details["jobArn"]] = (details, expires_at)
+                self._entries.move_to_end(details["jobArn"])
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def claim_missing(self, job_arns: list[str]) -> list[str]:
+        """Return the jobs which are neither cached nor being fetched, and mark them as being fetched.
+
+        The caller must `release` them once the fetch is over.
+        """
+        now = time.monotonic()
+        with self._lock:
+            missing = []
+            for job_arn in dict.fromkeys(job_arns):
+                entry = self._entries.get(job_arn)
+                if job_arn not in self._pending and (entry is None or entry[1] < now):
+                    missing.append(job_arn)
+            self._pending.update(missing)
+            return missing
+
+    def release(self, job_arns: list[str]):
+        with self._lock:
+            self._pending.difference_update(job_arns)
+
+    def invalidate(self, job_arns: list[str]):
+        with self._lock:
+            for job_arn in job_arns:
+                self._entries.pop(job_arn, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LogCache:
+    """Bounded LRU cache of the logs of finished jobs, keyed by log stream name.
+
+    Logs of jobs which are still running keep growing, so they're always fetched.
+    """
+
+    def __init__(self, max_lines: int = LOG_CACHE_MAX_LINES):
+        self.max_lines = max_lines
+        self.n_lines = 0
+        self._entries: OrderedDict[str, list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, log_stream_name: str) -> list[str] | None:
+        with self._lock:
+            lines = self._entries.get(log_stream_name)
+            if lines is not None:
+                self._entries.move_to_end(log_stream_name)
+            return lines
+
+    def put(self, log_stream_name: str, lines: list[str]):
+        if len(lines) > self.max_lines // 4:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(log_stream_name, None)
+            if previous is not None:
+                self.n_lines -= len(previous)
+            self._entries[log_stream_name] = lines
+            self.n_lines += len(lines)
+
+            while self.n_lines > self.max_lines:
+                _, evicted = self._entries.popitem(last=False)
+                self.n_lines -= len(evicted)
+
+    def iter_lines(self, client: boto3.client, log_stream_name: str, finished: bool) -> Iterator[str]:
+        """Yield the lines of a log stream from the cache, or fetch them (caching them if the job has finished).
+
+        The lines are only cached once they've all been read, so stopping early doesn't leave a partial log behind.
+        """
+        lines = self.get(log_stream_name)
+        if lines is not None:
+            yield from lines
+            return
+
+        lines = []
+        for line in get_log_events(client, log_stream_name):
+            if finished and len(lines) <= self.max_lines // 4:
+                lines.append(line)
+            yield line
+
+        if finished:
+            self.put(log_stream_name, lines)
+
+    def __len__(self) -> int:
+        return len(self._entries)
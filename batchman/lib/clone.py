@@ -0,0 +1,136 @@
+import threading
+from typing import Callable
+
+import boto3
+from joblib import Parallel, delayed
+
+from batchman.lib.batch import call_aws, get_jobs_details
+from batchman.lib.throttling import MAX_CONCURRENCY
+
+# top-level fields of job details which can be passed to submit_job as they are
+COPIED_FIELDS = [
+    "jobQueue",
+    "jobDefinition",
+    "parameters",
+    "retryStrategy",
+    "timeout",
+    "propagateTags",
+    "shareIdentifier",
+]
+# fields of job details which submit_job accepts under a different name
+RENAMED_FIELDS = {"schedulingPriority": "schedulingPriorityOverride"}
+COPIED_CONTAINER_FIELDS = ["command", "resourceRequirements"]
+# resubmitted children of array jobs get their original index in this variable, as AWS_BATCH_* variables are reserved
+ARRAY_INDEX_VARIABLE = "BATCHMAN_ARRAY_INDEX"
+
+
+def is_array_child(job: dict) -> bool:
+    """Whether a job is a child of an array job, whose IDs have the form `<array job ID>:<index>`."""
+    return ":" in job["jobId"]
+
+
+def build_submit_job_request(job_details: dict, overrides: dict | None = None) -> dict:
+    """Build a `submit_job` request which resubmits a job described by `describe_jobs`.
+
+    Children of array jobs are resubmitted as standalone jobs, with their array index in `ARRAY_INDEX_VARIABLE`
+    (AWS_BATCH_* variables such as AWS_BATCH_JOB_ARRAY_INDEX can't be set by the client). Dependencies of the original
+    job are not carried over.
+
+    Args:
+        job_details: job as returned by `describe_jobs`
+        overrides: fields replacing those of the request; `containerOverrides` is merged with the original
+    """
+    request = {"jobName": job_details["jobName"]}
+    request.update({key: job_details[key] for key in COPIED_FIELDS if job_details.get(key) is not None})
+    request.update(
+        {new_key: job_details[key] for key, new_key in RENAMED_FIELDS.items() if job_details.get(key) is not None}
+    )
+
+    tags = {key: value for key, value in job_details.get("tags", {}).items() if not key.startswith("aws:")}
+    if tags:
+        request["tags"] = tags
+
+    container = job_details.get("container", {})
+    container_overrides = {key: container[key] for key in COPIED_CONTAINER_FIELDS if container.get(key)}
+    environment = [var for var in container.get("environment", []) if not var["name"].startswith("AWS_BATCH")]
+    if environment:
+        container_overrides["environment"] = environment
+    if container_overrides:
+        request["containerOverrides"] = container_overrides
+
+    array_size = job_details.get("arrayProperties", {}).get("size")
+    if array_size:
+        request["arrayProperties"] = {"size": array_size}
+
+    overrides = dict(overrides or {})
+    if "containerOverrides" in overrides:
+        request["containerOverrides"] = {**request.get("containerOverrides", {}), **overrides.pop("containerOverrides")}
+    request.update(overrides)
+
+    array_index = job_details.get("arrayProperties", {}).get("index")
+    if array_index is not None:
+        # set last, so overriding the environment doesn't lose the index
+        container_overrides = request.setdefault("containerOverrides", {})
+        environment = [var for var in container_overrides.get("environment", []) if var["name"] != ARRAY_INDEX_VARIABLE]
+        container_overrides["environment"] = environment + [{"name": ARRAY_INDEX_VARIABLE, "value": str(array_index)}]
+
+    return request
+
+
+def submit_job(client: boto3.client, request: dict) -> str:
+    """Submit a job, returning its ID."""
+    return call_aws(client, "submit_job", **request)["jobId"]
+
+
+def clone_jobs(
+    client: boto3.client,
+    job_arns: list[str],
+    overrides: dict | None = None,
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Resubmit jobs, concurrently within the rate limits.
+
+    Args:
+        client: AWS Batch client
+        job_arns: ARNs (or IDs) of the jobs to clone
+        overrides: see `build_submit_job_request`
+        progress_callback: called with (number of finished jobs, total) after each submission
+
+    Returns:
+        IDs of the new jobs by the ID of the original job, and error messages by the ID of the original job.
+    """
+    jobs_details = get_jobs_details(client, job_arns)
+
+    lock = threading.Lock()
+    finished = 0
+
+    def clone_job(job_details: dict) -> tuple[str | None, str | None]:
+        nonlocal finished
+        try:
+            result = submit_job(client, build_submit_job_request(job_details, overrides)), None
+        except Exception as e:
+            result = None, str(e)
+
+        with lock:
+            finished += 1
+            if progress_callback is not None:
+                progress_callback(finished, len(jobs_details))
+        return result
+
+    results = Parallel(n_jobs=max(1, min(MAX_CONCURRENCY, len(jobs_details))), prefer="threads")(
+        delayed(clone_job)(job_details) for job_details in jobs_details
+    )
+
+    cloned, errors = {}, {}
+    found = {key for job_details in jobs_details for key in (job_details["jobArn"], job_details["jobId"])}
+    for job_arn in job_arns:
+        if job_arn not in found:
+            errors[job_arn] = "Job not found"
+
+    for job_details, (new_job_id, error) in zip(jobs_details, results):
+        if error is None:
+            cloned[job_details["jobId"]] = new_job_id
+        else:
+            errors[job_details["jobId"]] = error
+
+    return cloned, errors
@@ -0,0 +1,167 @@
+import csv
+import json
+import pathlib
+from typing import Callable, Iterable
+
+import boto3
+
+from batchman.lib.batch import batches, get_jobs_details
+
+# jobs are exported (and enriched with details) this many at a time, so memory use doesn't grow with the export size
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".parquet": "parquet"}
+
+# exported columns and their Parquet types
+SUMMARY_COLUMNS = {
+    "jobId": "string",
+    "jobName": "string",
+    "jobArn": "string",
+    "status": "string",
+    "createdAt": "int64",
+    "startedAt": "int64",
+    "stoppedAt": "int64",
+    "statusReason": "string",
+    "exitCode": "int64",
+    "arraySize": "int64",
+}
+DETAIL_COLUMNS = {
+    "jobDefinition": "string",
+    "jobQueue": "string",
+    "attempts": "int64",
+    "logStreamName": "string",
+    "containerReason": "string",
+}
+
+
+def get_export_format(path: str) -> str:
+    suffix = pathlib.Path(path).suffix.lower()
+    if suffix not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported file type '{suffix}', use one of: {', '.join(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[suffix]
+
+
+def job_to_row(job: dict, details: dict | None = None, with_details: bool = False) -> dict:
+    """Flatten a job summary (and optionally its details) into one exported row."""
+    source = details or job
+    container = source.get("container", {})
+    row = {
+        "jobId": job["jobId"],
+        "jobName": job["jobName"],
+        "jobArn": job["jobArn"],
+        "status": source["status"],
+        "createdAt": job["createdAt"],
+        "startedAt": source.get("startedAt"),
+        "stoppedAt": source.get("stoppedAt"),
+        "statusReason": source.get("statusReason"),
+        "exitCode": container.get("exitCode"),
+        "arraySize": source.get("arrayProperties", {}).get("size"),
+    }
+
+    if with_details:
+        details = details or {}
+        container = details.get("container", {})
+        row.update(
+            {
+                "jobDefinition": details.get("jobDefinition"),
+                "jobQueue": details.get("jobQueue"),
+                "attempts": len(details["attempts"]) if "attempts" in details else None,
+                "logStreamName": container.get("logStreamName"),
+                "containerReason": container.get("reason"),
+            }
+        )
+    return row
+
+
+class CsvExportWriter:
+    def __init__(self, path: str, columns: list[str]):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        self.writer.writeheader()
+
+    def write(self, rows: list[dict]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlExportWriter:
+    def __init__(self, path: str, columns: list[str]):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: list[dict]):
+        self.file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetExportWriter:
+    """Writes every chunk as one row group."""
+
+    def __init__(self, path: str, columns: list[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow, install it with `pip install batchman[parquet]`")
+
+        column_types = SUMMARY_COLUMNS | DETAIL_COLUMNS
+        self.pa = pa
+        self.schema = pa.schema([(column, getattr(pa, column_types[column])()) for column in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows: list[dict]):
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+EXPORT_WRITERS = {"csv": CsvExportWriter, "jsonl": JsonlExportWriter, "parquet": ParquetExportWriter}
+
+
+def export_jobs(
+    client: boto3.client,
+    jobs: Iterable[dict],
+    path: str,
+    with_details: bool = False,
+    total: int | None = None,
+    progress_callback: Callable[[int, int | None], None] | None = None,
+) -> int:
+    """Stream jobs into a CSV, JSONL or Parquet file (chosen by the file extension).
+
+    Jobs are processed in chunks of `EXPORT_CHUNK_SIZE`; with `with_details`, the details of each chunk are fetched
+    with concurrent batched `describe_jobs` calls before it's written.
+
+    Args:
+        client: AWS Batch client
+        jobs: job summaries as returned by `list_jobs`
+        path: output file
+        with_details: add fields which are only available from `describe_jobs`
+        total: number of jobs, only used for progress reporting
+        progress_callback: called with (number of exported jobs, total) after each chunk
+
+    Returns:
+        The number of exported jobs.
+    """
+    columns = list(SUMMARY_COLUMNS) + (list(DETAIL_COLUMNS) if with_details else [])
+    writer = EXPORT_WRITERS[get_export_format(path)](str(pathlib.Path(path).expanduser()), columns)
+
+    exported = 0
+    try:
+        for chunk in batches(jobs, EXPORT_CHUNK_SIZE):
+            details_by_arn = {}
+            if with_details:
+                jobs_details = get_jobs_details(client, [job["jobArn"] for job in chunk])
+                details_by_arn = {details["jobArn"]: details for details in jobs_details}
+
+            writer.write([job_to_row(job, details_by_arn.get(job["jobArn"]), with_details) for job in chunk])
+            exported += len(chunk)
+            if progress_callback is not None:
+                progress_callback(exported, total)
+    finally:
+        writer.close()
+
+    return exported
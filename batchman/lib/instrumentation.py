@@ -0,0 +1,133 @@
+import bisect
+import json
+import pathlib
+import threading
+import time
+from contextlib import contextmanager
+
+# upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+
+class Histogram:
+    """Latency histogram with fixed buckets."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        """Approximate percentile (upper bound of the bucket containing it)."""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + [self.max_ms], self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS_MS] + ["inf"], self.counts)),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of counters and latency histograms.
+
+    Recording is a no-op until `enable` is called, so instrumented code paths only pay for an attribute lookup
+    when the debug panel and tracing are off.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._trace_file = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters: dict[str, int] = {}
+            self.histograms: dict[str, Histogram] = {}
+            self.started_at = time.monotonic()
+
+    def enable(self, trace_path: str | None = None):
+        """Start recording, optionally appending every observation to a JSONL trace file."""
+        with self._lock:
+            if trace_path and self._trace_file is None:
+                self._trace_file = open(pathlib.Path(trace_path).expanduser(), "a", buffering=1)
+            self.enabled = True
+
+    def disable(self):
+        with self._lock:
+            self.enabled = False
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
+
+    @property
+    def tracing(self) -> bool:
+        return self._trace_file is not None
+
+    def increment(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float, **fields):
+        """Record a duration in the histogram `name` (and the trace file, if any)."""
+        if not self.enabled:
+            return
+
+        ms = seconds * 1000
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].add(ms)
+
+            if self._trace_file is not None:
+                record = {"ts": time.time(), "name": name, "ms": round(ms, 3), **fields}
+                self._trace_file.write(json.dumps(record, default=str) + "\n")
+
+    @contextmanager
+    def timer(self, name: str, **fields):
+        """Context manager recording the duration of the block in the histogram `name`."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **fields)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "uptime_s": time.monotonic() - self.started_at,
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            }
+
+
+# global registry used by the whole app
+metrics = Metrics()
@@ -0,0 +1,127 @@
+import bisect
+from typing import Callable, Iterable
+
+
+def job_name(record) -> str:
+    return record.job["jobName"]
+
+
+def job_created_at(record) -> int:
+    return record.job["createdAt"]
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """The smallest string greater than all strings starting with `prefix`."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SortedRecords:
+    """Records sorted by a key, supporting range queries by bisection.
+
+    Added records are buffered and merged into the sorted list by the next query, which keeps adding jobs page by
+    page cheap.
+    """
+
+    def __init__(self, key: Callable):
+        self.key = key
+        self._sorted: list = []
+        self._unsorted: list = []
+
+    def add(self, records: Iterable):
+        self._unsorted.extend(records)
+
+    def remove(self, records: set):
+        self._sort()
+        self._sorted = [record for record in self._sorted if record not in records]
+
+    def _sort(self):
+        if self._unsorted:
+            # timsort merges the already sorted run with the new records in close to linear time
+            self._sorted.extend(self._unsorted)
+            self._sorted.sort(key=self.key)
+            self._unsorted = []
+
+    def _range(self, low, high) -> tuple[int, int]:
+        self._sort()
+        start = bisect.bisect_left(self._sorted, low, key=self.key) if low is not None else 0
+        end = bisect.bisect_left(self._sorted, high, lo=start, key=self.key) if high is not None else len(self._sorted)
+        return start, end
+
+    def between(self, low, high) -> list:
+        """Records with keys in [low, high), either bound can be None."""
+        start, end = self._range(low, high)
+        return self._sorted[start:end]
+
+    def count_between(self, low, high) -> int:
+        start, end = self._range(low, high)
+        return end - start
+
+
+class JobIndex:
+    """Secondary indexes of job records for filtering without scanning all jobs.
+
+    Records are kept sorted by job name, so all jobs with a name prefix are found by bisection in O(log n + k), sorted
+    by creation time for time windows, and grouped by status.
+
+    Records can be any objects with a `job` attribute holding the job summary (e.g. `JobRecord`), compared by identity.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._by_name = SortedRecords(job_name)
+        self._by_created_at = SortedRecords(job_created_at)
+        self._by_status: dict[str, dict] = {}  # dicts as insertion-ordered sets
+
+    def add(self, records: Iterable):
+        records = list(records)
+        self._by_name.add(records)
+        self._by_created_at.add(records)
+        for record in records:
+            self._by_status.setdefault(record.job["status"], {})[record] = None
+
+    def remove(self, records: Iterable):
+        records = set(records)
+        if not records:
+            return
+
+        self._by_name.remove(records)
+        self._by_created_at.remove(records)
+        for record in records:
+            self._by_status.get(record.job["status"], {}).pop(record, None)
+
+    def with_name_prefix(self, prefix: str) -> list:
+        return self._by_name.between(prefix, prefix_upper_bound(prefix))
+
+    def created_between(self, created_after: int | None, created_before: int | None) -> list:
+        return self._by_created_at.between(created_after, created_before)
+
+    def with_statuses(self, statuses: Iterable[str]) -> list:
+        return [record for status in statuses for record in self._by_status.get(status, ())]
+
+    def candidates(
+        self,
+        name_prefix: str,
+        statuses: list[str],
+        created_after: int | None = None,
+        created_before: int | None = None,
+    ) -> list | None:
+        """Return a superset of the records passing the filters, or None for all records.
+
+        Only the smallest of the applicable index lookups is materialized, the caller still has to check each candidate.
+        """
+        lookups = []  # (number of candidates, function returning them)
+        if name_prefix:
+            count = self._by_name.count_between(name_prefix, prefix_upper_bound(name_prefix))
+            lookups.append((count, lambda: self.with_name_prefix(name_prefix)))
+        if statuses:
+            count = sum(len(self._by_status.get(status, ())) for status in statuses)
+            lookups.append((count, lambda: self.with_statuses(statuses)))
+        if created_after is not None or created_before is not None:
+            count = self._by_created_at.count_between(created_after, created_before)
+            lookups.append((count, lambda: self.created_between(created_after, created_before)))
+
+        if not lookups:
+            return None
+        return min(lookups, key=lambda lookup: lookup[0])[1]()
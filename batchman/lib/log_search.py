@@ -0,0 +1,113 @@
+import itertools
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+import boto3
+from joblib import Parallel, delayed
+
+from batchman.lib.batch import get_log_events
+from batchman.lib.cache import LogCache
+
+# number of log streams read at the same time (the logs rate limiter still applies)
+LOG_SEARCH_CONCURRENCY = 8
+LOG_SEARCH_MAX_MATCHES = 1000
+LOG_SEARCH_CONTEXT_LINES = 2
+
+
+@dataclass
+class LogSearchTarget:
+    job_id: str
+    job_name: str
+    log_stream_name: str
+    finished: bool  # logs of finished jobs can be cached
+
+
+@dataclass
+class LogMatch:
+    job_id: str
+    job_name: str
+    line_number: int  # 1-based
+    line: str
+    context_before: list[str] = field(default_factory=list)
+    context_after: list[str] = field(default_factory=list)
+
+
+@dataclass
+class LogSearchSummary:
+    matches: int
+    streams_searched: int
+    streams_total: int
+    stopped: bool  # cancelled or the match limit was reached
+
+
+def find_matches(
+    lines: Iterable[str], regex: re.Pattern, target: LogSearchTarget, context_lines: int = LOG_SEARCH_CONTEXT_LINES
+) -> Iterator[LogMatch]:
+    """Yield the lines matching the regex, each once the lines following it (its context) have been read."""
+    before = deque(maxlen=context_lines)
+    pending: list[LogMatch] = []  # matches still waiting for their context
+
+    for line_number, line in enumerate(lines, start=1):
+        while pending and len(pending[0].context_after) == context_lines:
+            yield pending.pop(0)
+        for match in pending:
+            match.context_after.append(line)
+
+        if regex.search(line):
+            pending.append(LogMatch(target.job_id, target.job_name, line_number, line, list(before)))
+        before.append(line)
+
+    yield from pending
+
+
+def search_logs(
+    client: boto3.client,
+    targets: list[LogSearchTarget],
+    regex: re.Pattern,
+    on_match: Callable[[LogMatch], None],
+    log_cache: LogCache | None = None,
+    stop_event: threading.Event | None = None,
+    max_matches: int = LOG_SEARCH_MAX_MATCHES,
+    context_lines: int = LOG_SEARCH_CONTEXT_LINES,
+) -> LogSearchSummary:
+    """Search log streams concurrently, reporting every match through `on_match` (called from worker threads).
+
+    The search stops early once `max_matches` matches were found or `stop_event` is set; streams which weren't
+    started yet are skipped and the ones being read stop at the next line.
+    """
+    stop_event = stop_event or threading.Event()
+    lock = threading.Lock()
+    matches = 0
+    streams_searched = 0
+
+    def search_stream(target: LogSearchTarget):
+        nonlocal matches, streams_searched
+        if stop_event.is_set():
+            return
+
+        if log_cache is not None:
+            lines = log_cache.iter_lines(client, target.log_stream_name, target.finished)
+        else:
+            lines = get_log_events(client, target.log_stream_name)
+
+        lines = itertools.takewhile(lambda _: not stop_event.is_set(), lines)
+        for match in find_matches(lines, regex, target, context_lines):
+            with lock:
+                if stop_event.is_set():
+                    return
+                matches += 1
+                if matches == max_matches:
+                    stop_event.set()
+            on_match(match)
+
+        with lock:
+            if not stop_event.is_set():  # otherwise the stream was only read partially
+                streams_searched += 1
+
+    Parallel(n_jobs=max(1, min(LOG_SEARCH_CONCURRENCY, len(targets))), prefer="threads")(
+        delayed(search_stream)(target) for target in targets
+    )
+    return LogSearchSummary(matches, streams_searched, len(targets), stop_event.is_set())
@@ -0,0 +1,100 @@
+import math
+import threading
+from collections import Counter
+
+HOUR_MS = 3600 * 1000
+# runtimes are bucketed geometrically, so percentiles are accurate to ~10 %
+RUNTIME_BUCKET_BASE = 1.1
+
+
+def runtime_bucket(runtime_s: float) -> int:
+    return int(math.log1p(max(runtime_s, 0.0)) / math.log(RUNTIME_BUCKET_BASE))
+
+
+def runtime_bucket_upper_bound(bucket: int) -> float:
+    return math.expm1((bucket + 1) * math.log(RUNTIME_BUCKET_BASE))
+
+
+def job_runtime_s(job: dict) -> float | None:
+    if "startedAt" in job and "stoppedAt" in job:
+        return (job["stoppedAt"] - job["startedAt"]) / 1000
+    return None
+
+
+class QueueStats:
+    """Aggregate statistics of a job queue, maintained incrementally.
+
+    Every job contributes to a handful of counters when it is added, and is subtracted again when it is removed or
+    replaced by a newer version (e.g. with a changed status after a refresh), so reading the statistics never rescans
+    the jobs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.status_counts = Counter()
+            self.hourly_counts = Counter()  # job creation counts by hour since epoch
+            self.runtime_buckets = Counter()
+            self.runtime_count = 0
+            self.runtime_total_s = 0.0
+            self.total = 0
+            self.version = 0  # bumped on every change, so readers can skip redundant redraws
+
+    def _apply(self, jobs: list[dict], sign: int):
+        runtimes = [runtime for runtime in map(job_runtime_s, jobs) if runtime is not None]
+
+        with self._lock:
+            statuses = Counter(job["status"] for job in jobs)
+            hours = Counter(job["createdAt"] // HOUR_MS for job in jobs)
+            buckets = Counter(map(runtime_bucket, runtimes))
+
+            if sign > 0:
+                self.status_counts.update(statuses)
+                self.hourly_counts.update(hours)
+                self.runtime_buckets.update(buckets)
+            else:
+                self.status_counts.subtract(statuses)
+                self.hourly_counts.subtract(hours)
+                self.runtime_buckets.subtract(buckets)
+
+            self.runtime_count += sign * len(runtimes)
+            self.runtime_total_s += sign * sum(runtimes)
+            self.total += sign * len(jobs)
+            self.version += 1
+
+    def add(self, jobs: list[dict]):
+        self._apply(jobs, +1)
+
+    def remove(self, jobs: list[dict]):
+        self._apply(jobs, -1)
+
+    def replace(self, old_jobs: list[dict], new_jobs: list[dict]):
+        self.remove(old_jobs)
+        self.add(new_jobs)
+
+    def jobs_per_hour(self, hours: int, now_ms: int) -> list[int]:
+        """Number of created jobs in each of the last `hours` hours, oldest first."""
+        current_hour = now_ms // HOUR_MS
+        with self._lock:
+            return [self.hourly_counts.get(hour, 0) for hour in range(current_hour - hours + 1, current_hour + 1)]
+
+    def runtime_percentile(self, q: float) -> float | None:
+        """Approximate runtime percentile in seconds."""
+        with self._lock:
+            if not self.runtime_count:
+                return None
+
+            rank = q * self.runtime_count
+            seen = 0
+            for bucket in sorted(b for b, count in self.runtime_buckets.items() if count > 0):
+                seen += self.runtime_buckets[bucket]
+                if seen >= rank:
+                    return runtime_bucket_upper_bound(bucket)
+        return None
+
+    @property
+    def runtime_mean_s(self) -> float | None:
+        return self.runtime_total_s / self.runtime_count if self.runtime_count else None
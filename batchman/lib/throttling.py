@@ -0,0 +1,200 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# requests per second and burst size of each service; these are below the default account limits
+# (e.g. CloudWatch Logs GetLogEvents allows 25 requests per second per account and region)
+DEFAULT_RATES = {
+    "batch": (40.0, 80),
+    "logs": (20.0, 25),
+}
+FALLBACK_RATE = (10.0, 10)
+
+# bounds of the number of concurrent requests per service
+MIN_CONCURRENCY = 1
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+
+# backoff of retried throttled requests, in seconds
+BACKOFF_BASE = 0.2
+BACKOFF_CAP = 10.0
+MAX_ATTEMPTS = 8
+
+# adaptation of the request rate when throttled
+MIN_RATE = 1.0
+RATE_DECREASE_FACTOR = 0.7
+RATE_INCREASE_STEP = 0.05
+
+THROUGHPUT_WINDOW_S = 10.0
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+
+class TokenBucket:
+    """Blocking token bucket rate limiter.
+
+    The rate can be lowered when the service throttles us, and recovers slowly up to `max_rate`.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def decrease_rate(self):
+        with self._lock:
+            self.rate = max(MIN_RATE, self.rate * RATE_DECREASE_FACTOR)
+
+    def increase_rate(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE_STEP)
+
+
+class AIMDConcurrencyLimiter:
+    """Limits the number of requests in flight, adapting the limit to throttling.
+
+    The limit grows by one for every `limit` successful requests (additive increase) and is halved when a request
+    is throttled (multiplicative decrease), at most once per `decrease_cooldown` seconds so that one burst of
+    throttled requests only counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int = INITIAL_CONCURRENCY,
+        minimum: int = MIN_CONCURRENCY,
+        maximum: int = MAX_CONCURRENCY,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self.decreased_at = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self):
+        with self._condition:
+            previous = int(self.limit)
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            if int(self.limit) > previous:
+                self._condition.notify()
+
+    def on_throttled(self) -> bool:
+        """Returns whether the limit was decreased."""
+        with self._condition:
+            now = time.monotonic()
+            if now - self.decreased_at < self.decrease_cooldown:
+                return False
+
+            self.limit = max(self.minimum, self.limit / 2)
+            self.decreased_at = now
+            return True
+
+
+class ServiceRateLimiter:
+    """Rate and concurrency limits shared by all calls to one AWS service."""
+
+    def __init__(self, service: str, rate: float, capacity: int):
+        self.service = service
+        self.bucket = TokenBucket(rate, capacity)
+        self.concurrency = AIMDConcurrencyLimiter()
+        self.throttled = 0
+        self._completed_at = deque()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        """Wait until a request may be sent, and hold a concurrency slot while it is in flight."""
+        self.concurrency.acquire()
+        try:
+            self.bucket.acquire()
+            yield
+        finally:
+            self.concurrency.release()
+
+    def on_success(self):
+        self.concurrency.on_success()
+        self.bucket.increase_rate()
+        with self._lock:
+            self._completed_at.append(time.monotonic())
+
+    def on_throttled(self):
+        if self.concurrency.on_throttled():
+            self.bucket.decrease_rate()
+        with self._lock:
+            self.throttled += 1
+
+    def throughput(self) -> float:
+        """Successful requests per second over the last few seconds."""
+        with self._lock:
+            cutoff = time.monotonic() - THROUGHPUT_WINDOW_S
+            while self._completed_at and self._completed_at[0] < cutoff:
+                self._completed_at.popleft()
+            return len(self._completed_at) / THROUGHPUT_WINDOW_S
+
+    def to_dict(self) -> dict:
+        return {
+            "rate": self.bucket.rate,
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "throttled": self.throttled,
+            "throughput": self.throughput(),
+        }
+
+
+_limiters: dict[str, ServiceRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(service: str) -> ServiceRateLimiter:
+    """Return the rate limiter shared by all calls to the service."""
+    with _limiters_lock:
+        if service not in _limiters:
+            rate, capacity = DEFAULT_RATES.get(service, FALLBACK_RATE)
+            _limiters[service] = ServiceRateLimiter(service, rate, capacity)
+        return _limiters[service]
+
+
+def set_rate_limit(service: str, rate: float, capacity: int):
+    """Override the request rate of a service (e.g. for accounts with raised limits)."""
+    limiter = get_rate_limiter(service)
+    limiter.bucket = TokenBucket(rate, capacity)
+
+
+def get_rate_limiters() -> dict[str, ServiceRateLimiter]:
+    with _limiters_lock:
+        return dict(_limiters)
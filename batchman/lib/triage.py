@@ -0,0 +1,130 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable
+
+import boto3
+
+from batchman.lib.batch import batches, get_array_child_jobs_page, get_jobs_details
+from batchman.lib.cache import FINAL_STATUSES
+
+# details of failed jobs are fetched this many at a time (each chunk is fetched with concurrent describe_jobs calls)
+TRIAGE_CHUNK_SIZE = 1000
+# failed children of array jobs are listed in pages of this size
+ARRAY_CHILD_PAGE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class FailedJob:
+    """The parts of the details of a failed job relevant for triage."""
+
+    job_id: str
+    job_arn: str
+    job_name: str
+    status_reason: str
+    exit_code: int | None
+    container_reason: str | None
+    log_stream_name: str | None
+
+    @classmethod
+    def from_details(cls, job_details: dict) -> "FailedJob":
+        container = job_details.get("container", {})
+        return cls(
+            job_id=job_details["jobId"],
+            job_arn=job_details["jobArn"],
+            job_name=job_details["jobName"],
+            status_reason=job_details.get("statusReason", ""),
+            exit_code=container.get("exitCode"),
+            container_reason=container.get("reason"),
+            log_stream_name=container.get("logStreamName"),
+        )
+
+    def to_job(self) -> dict:
+        """A job summary with the fields needed to kill or resubmit the job."""
+        return {"jobId": self.job_id, "jobArn": self.job_arn, "jobName": self.job_name}
+
+
+@dataclass
+class FailureGroup:
+    status_reason: str
+    exit_code: int | None
+    jobs: list[FailedJob] = field(default_factory=list)
+
+
+def group_failures(failed_jobs: list[FailedJob]) -> list[FailureGroup]:
+    """Group failed jobs by status reason and exit code, largest groups first."""
+    groups = defaultdict(list)
+    for failed_job in failed_jobs:
+        groups[(failed_job.status_reason, failed_job.exit_code)].append(failed_job)
+
+    return sorted(
+        (FailureGroup(status_reason, exit_code, jobs) for (status_reason, exit_code), jobs in groups.items()),
+        key=lambda group: len(group.jobs),
+        reverse=True,
+    )
+
+
+class FailureTriageCache:
+    """Failed jobs seen so far, so reopening the triage doesn't fetch anything again.
+
+    Failed jobs never change, so they're cached by ARN for the lifetime of the app. Failed children of array jobs
+    are only cached once the array job itself has finished.
+    """
+
+    def __init__(self):
+        self.failed_jobs: dict[str, FailedJob] = {}
+        self.array_children: dict[str, list[str]] = {}  # ARNs of the failed children by array job ARN
+
+    def is_cached(self, job_arns: list[str], array_jobs: list[dict]) -> bool:
+        return all(job_arn in self.failed_jobs for job_arn in job_arns) and all(
+            array_job["jobArn"] in self.array_children for array_job in array_jobs
+        )
+
+
+def list_failed_array_children(client: boto3.client, array_job: dict) -> list[str]:
+    job_arns, next_token = [], None
+    while True:
+        child_jobs, next_token = get_array_child_jobs_page(
+            client, array_job, "FAILED", ARRAY_CHILD_PAGE_SIZE, next_token
+        )
+        job_arns.extend(child_job["jobArn"] for child_job in child_jobs)
+        if next_token is None:
+            return job_arns
+
+
+def collect_failed_jobs(
+    client: boto3.client,
+    job_arns: list[str],
+    array_jobs: list[dict],
+    cache: FailureTriageCache,
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> list[FailedJob]:
+    """Fetch the details of failed jobs, including all failed children of the given array jobs.
+
+    Args:
+        client: AWS Batch client
+        job_arns: ARNs of failed jobs
+        array_jobs: array jobs (as returned by `list_jobs` or `describe_jobs`) whose failed children are included
+        cache: jobs found in the cache aren't fetched again, fetched ones are added to it
+        progress_callback: called with (number of jobs with details, total) after each chunk
+    """
+    job_arns = list(job_arns)
+    for array_job in array_jobs:
+        children = cache.array_children.get(array_job["jobArn"])
+        if children is None:
+            children = list_failed_array_children(client, array_job)
+            if array_job["status"] in FINAL_STATUSES:
+                cache.array_children[array_job["jobArn"]] = children
+        job_arns.extend(children)
+
+    job_arns = list(dict.fromkeys(job_arns))
+    missing = [job_arn for job_arn in job_arns if job_arn not in cache.failed_jobs]
+    done = len(job_arns) - len(missing)
+    for chunk in batches(missing, TRIAGE_CHUNK_SIZE):
+        for job_details in get_jobs_details(client, chunk):
+            if job_details["status"] == "FAILED":  # jobs may have been retried since they were listed
+                cache.failed_jobs[job_details["jobArn"]] = FailedJob.from_details(job_details)
+        done += len(chunk)
+        if progress_callback is not None:
+            progress_callback(done, len(job_arns))
+
+    return [cache.failed_jobs[job_arn] for job_arn in job_arns if job_arn in cache.failed_jobs]
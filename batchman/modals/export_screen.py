@@ -0,0 +1,43 @@
+from textual.app import ComposeResult
+from textual.containers import HorizontalGroup, Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Button, Checkbox, Input, Rule, Static
+
+
+class ExportScreen(ModalScreen):
+    """Screen to choose the file jobs are exported to."""
+
+    def __init__(self, prompt_text: str, on_confirm_callback: callable, default_file_name: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prompt_text = prompt_text
+        self.default_file_name = default_file_name
+        self.confirm_callback = on_confirm_callback
+
+        self.AUTO_FOCUS = "Input"
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Static(self.prompt_text, id="question"),
+            Input(self.default_file_name, id="input"),
+            Checkbox("Include job details (exit code, attempts, log stream...)", id="with-details"),
+            Rule(),
+            HorizontalGroup(
+                Button("Export", variant="success", id="confirm"),
+                Static("", classes="spacer"),
+                Button("Cancel", variant="primary", id="cancel"),
+            ),
+            id="export-screen",
+        )
+
+    def confirm(self):
+        self.app.pop_screen()
+        self.confirm_callback(self.query_one("#input", Input).value, self.query_one("#with-details", Checkbox).value)
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "confirm":
+            self.confirm()
+        else:
+            self.app.pop_screen()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        self.confirm()
@@ -0,0 +1,58 @@
+from textual.app import ComposeResult
+from textual.containers import Grid, HorizontalGroup
+from textual.message import Message
+from textual.screen import ModalScreen
+from textual.widgets import Button, DataTable, Rule, Static
+
+from batchman.lib.triage import FailureGroup
+
+
+class FailureTriageScreen(ModalScreen):
+    """Screen grouping failed jobs by status reason and exit code."""
+
+    def __init__(self, groups: list[FailureGroup], on_action_callback: callable, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.groups = groups
+        self.action_callback = on_action_callback
+
+        self.AUTO_FOCUS = "DataTable"
+
+    def compose(self) -> ComposeResult:
+        n_jobs = sum(len(group.jobs) for group in self.groups)
+        yield Grid(
+            Static(f"{n_jobs} failed jobs in {len(self.groups)} groups", id="question"),
+            DataTable(cursor_type="row", id="failure-groups"),
+            Rule(),
+            HorizontalGroup(
+                Button("Close", variant="primary", id="close"),
+                Static("", classes="spacer"),
+                Button("Search logs", id="logs"),
+                Button("Kill", variant="error", id="kill"),
+                Button("Resubmit", variant="success", id="resubmit"),
+            ),
+            id="failure-triage-screen",
+        )
+
+    def on_mount(self):
+        table = self.query_one("#failure-groups", DataTable)
+        table.add_columns("Jobs", "Exit code", "Status reason", "Container reason")
+        for group in self.groups:
+            container_reasons = {job.container_reason for job in group.jobs if job.container_reason}
+            table.add_row(
+                len(group.jobs),
+                "-" if group.exit_code is None else group.exit_code,
+                group.status_reason or "-",
+                # only shown when the whole group shares it
+                container_reasons.pop() if len(container_reasons) == 1 else "-",
+            )
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        self.app.pop_screen()
+        if event.button.id != "close":
+            group = self.groups[self.query_one("#failure-groups", DataTable).cursor_row]
+            self.action_callback(event.button.id, group)
+
+    def on_key(self, event: Message):
+        if event.key in ("escape", "q"):
+            event.stop()
+            self.app.pop_screen()
@@ -0,0 +1,99 @@
+import threading
+
+from rich.markup import escape
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.containers import Grid, HorizontalGroup
+from textual.message import Message
+from textual.screen import ModalScreen
+from textual.widgets import Button, DataTable, Rule, Static
+
+from batchman.lib.log_search import LogMatch, LogSearchSummary
+
+# longer lines are truncated in the table (the full line is shown with its context)
+MAX_LINE_LENGTH = 200
+
+
+class LogSearchScreen(ModalScreen):
+    """Screen listing log lines matching a search as they're found."""
+
+    def __init__(self, pattern: str, n_jobs: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pattern = pattern
+        self.n_jobs = n_jobs
+        self.matches: list[LogMatch] = []
+        self.stop_event = threading.Event()  # set to cancel the search
+
+        self.AUTO_FOCUS = "DataTable"
+
+    def compose(self) -> ComposeResult:
+        # columns are added right away, matches can arrive before the screen is mounted
+        matches_table = DataTable(cursor_type="row", id="log-matches")
+        matches_table.add_columns("Job", "Job ID", "Line", "Text")
+        yield Grid(
+            Static(f"Searching the logs of {self.n_jobs} jobs for '{escape(self.pattern)}'...", id="question"),
+            matches_table,
+            Static("", id="match-context"),
+            Rule(),
+            HorizontalGroup(
+                Button("Close", variant="primary", id="close"),
+                Static("", classes="spacer"),
+                Button("Stop", variant="error", id="stop"),
+            ),
+            id="log-search-screen",
+        )
+
+    def add_match(self, match: LogMatch):
+        if not self.is_attached:
+            return  # closed in the meantime
+
+        self.matches.append(match)
+        self.query_one("#log-matches", DataTable).add_row(
+            # log lines aren't markup
+            Text(match.job_name),
+            match.job_id,
+            match.line_number,
+            Text(match.line[:MAX_LINE_LENGTH]),
+        )
+        self.query_one("#question", Static).update(
+            f"Searching the logs of {self.n_jobs} jobs for '{escape(self.pattern)}'... {len(self.matches)} matches"
+        )
+
+    def finish(self, summary: LogSearchSummary):
+        if not self.is_attached:
+            return
+
+        status = f"{summary.matches} matches in {summary.streams_searched} of {summary.streams_total} log streams"
+        if summary.stopped:
+            status += " (stopped early)"
+        self.query_one("#question", Static).update(status)
+        self.query_one("#stop", Button).disabled = True
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted):
+        if not 0 <= event.cursor_row < len(self.matches):
+            return
+
+        match = self.matches[event.cursor_row]
+        first_line_number = match.line_number - len(match.context_before)
+        lines = match.context_before + [match.line] + match.context_after
+        self.query_one("#match-context", Static).update(
+            Text(
+                "\n".join(
+                    f"{'>' if line_number == match.line_number else ' '} {line_number:>6} {line}"
+                    for line_number, line in enumerate(lines, start=first_line_number)
+                )
+            )
+        )
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "stop":
+            self.stop_event.set()
+        elif event.button.id == "close":
+            self.stop_event.set()
+            self.app.pop_screen()
+
+    def on_key(self, event: Message):
+        if event.key in ("escape", "q"):
+            event.stop()
+            self.stop_event.set()
+            self.app.pop_screen()
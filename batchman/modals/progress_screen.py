@@ -0,0 +1,24 @@
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import ProgressBar, Rule, Static
+
+
+class ProgressScreen(ModalScreen):
+    """Screen showing the progress of a long-running operation."""
+
+    def __init__(self, prompt_text: str, total: int | None = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prompt_text = prompt_text
+        self.total = total
+
+    def compose(self) -> ComposeResult:
+        yield Vertical(
+            Static(self.prompt_text, id="question"),
+            Rule(),
+            ProgressBar(total=self.total, id="progress"),
+            id="progress-screen",
+        )
+
+    def update_progress(self, progress: int, total: int | None = None):
+        self.query_one("#progress", ProgressBar).update(progress=progress, total=total)
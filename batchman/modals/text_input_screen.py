@@ -34,3 +34,7 @@ class TextInputScreen(ModalScreen):
         self.app.pop_screen()
         if event.button.id == "confirm":
             self.confirm_callback(self.query_one("#input").value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        self.app.pop_screen()
+        self.confirm_callback(event.value)
@@ -0,0 +1,57 @@
+from rich.table import Table
+from textual.widgets import Static
+
+from batchman.lib.instrumentation import metrics
+from batchman.lib.throttling import get_rate_limiters
+
+
+class DebugPanel(Static):
+    """Shows the counters and latency histograms collected by `batchman.lib.instrumentation`."""
+
+    REFRESH_INTERVAL = 1.0
+
+    def on_mount(self):
+        self.set_interval(self.REFRESH_INTERVAL, self.update_metrics)
+
+    def update_metrics(self):
+        if not self.display:
+            return
+
+        snapshot = metrics.snapshot()
+
+        latencies = Table("Call", "Count", "Mean ms", "p50 ms", "p95 ms", "Max ms", box=None, expand=True)
+        for name, histogram in sorted(snapshot["histograms"].items()):
+            latencies.add_row(
+                name,
+                str(histogram["count"]),
+                f"{histogram['mean_ms']:.1f}",
+                f"{histogram['p50_ms']:.0f}",
+                f"{histogram['p95_ms']:.0f}",
+                f"{histogram['max_ms']:.1f}",
+            )
+
+        counters = Table("Counter", "Value", box=None, expand=True)
+        for name, value in sorted(snapshot["counters"].items()):
+            counters.add_row(name, str(value))
+
+        limits = Table("Service", "Rate/s", "Concurrency", "In flight", "Throttled", "Calls/s", box=None, expand=True)
+        for service, limiter in sorted(get_rate_limiters().items()):
+            stats = limiter.to_dict()
+            limits.add_row(
+                service,
+                f"{stats['rate']:.0f}",
+                str(stats["concurrency_limit"]),
+                str(stats["in_flight"]),
+                str(stats["throttled"]),
+                f"{stats['throughput']:.1f}",
+            )
+
+        layout = Table.grid(expand=True)
+        layout.add_column(ratio=3)
+        layout.add_column(ratio=2)
+        layout.add_row(latencies, counters)
+        layout.add_row(limits, "")
+
+        trace = " (tracing)" if metrics.tracing else ""
+        self.border_title = f"Debug - {snapshot['uptime_s']:.0f} s{trace}"
+        self.update(layout)
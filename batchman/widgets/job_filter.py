@@ -1,21 +1,96 @@
-from dataclasses import dataclass
+import fnmatch
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable
+
 from textual.containers import Vertical
-from textual.widgets import Label, Input, SelectionList, Static, Rule
 from textual.message import Message
+from textual.widgets import Input, Label, Rule, Select, SelectionList, Static
+
+NAME_MODES = {
+    "prefix": "Name prefix...",
+    "substring": "Part of the name...",
+    "glob": "Glob pattern, e.g. train-*-v?...",
+    "regex": "Regular expression...",
+}
+GLOB_WILDCARDS = re.compile(r"[*?\[]")
+# time windows of the creation time filter, in seconds before now
+TIME_WINDOWS = {
+    "all": ("All time", None),
+    "1h": ("Last hour", 3600),
+    "24h": ("Last 24 hours", 24 * 3600),
+    "7d": ("Last 7 days", 7 * 24 * 3600),
+    "custom": ("Custom range", None),
+}
+
+
+def time_window_start(time_window: str, now_ms: int | None = None) -> int | None:
+    """Start of a relative time window in ms since epoch, or None if it's unbounded."""
+    seconds = TIME_WINDOWS[time_window][1] if time_window in TIME_WINDOWS else None
+    if seconds is None:
+        return None
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    return now_ms - seconds * 1000
+
+
+def parse_time(value: str) -> int | None:
+    """Parse local time such as "2024-05-01 13:00" into ms since epoch, raising `ValueError` if it's invalid."""
+    if not value.strip():
+        return None
+    return int(datetime.fromisoformat(value.strip()).timestamp() * 1000)
+
+
+def compile_name_matcher(pattern: str, mode: str) -> Callable[[str], bool]:
+    """Return a function testing whether a job name matches the pattern, raising `re.error` for invalid regexes."""
+    if mode == "prefix":
+        return lambda name: name.startswith(pattern)
+    if mode == "substring":
+        return lambda name: pattern in name
+    if mode == "glob":
+        return re.compile(fnmatch.translate(pattern)).match
+    if mode == "regex":
+        return re.compile(pattern).search
+    raise ValueError(f"Unknown name filter mode: {mode}")
 
 
 @dataclass
 class FilterSettings:
     job_name: str
     statuses: list[str]
+    name_mode: str = "prefix"
+    time_window: str = "all"
+    created_after: int | None = None  # in ms since epoch, inclusive
+    created_before: int | None = None  # in ms since epoch, exclusive
+    name_matcher: Callable[[str], bool] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name_matcher = compile_name_matcher(self.job_name, self.name_mode)
+
+    @property
+    def name_prefix(self) -> str:
+        """A prefix which all matching job names share, usable with the sorted name index."""
+        if self.name_mode == "prefix":
+            return self.job_name
+        if self.name_mode == "glob":
+            return GLOB_WILDCARDS.split(self.job_name, maxsplit=1)[0]
+        return ""
 
     def job_matches(self, job: dict) -> bool:
-        if self.job_name and not job["jobName"].startswith(self.job_name):
+        if self.job_name and not self.name_matcher(job["jobName"]):
             return False
 
         if self.statuses and job["status"] not in self.statuses:
             return False
 
+        if self.created_after is not None and job["createdAt"] < self.created_after:
+            return False
+
+        if self.created_before is not None and job["createdAt"] >= self.created_before:
+            return False
+
         return True
 
 
@@ -25,12 +100,17 @@ class JobFilter(Static):
             self.filter_settings = filter_settings
             super().__init__()
 
+    def __init__(self, *args, time_window: str = "all", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.time_window = time_window if time_window in TIME_WINDOWS else "all"
+
     def compose(self):
         yield Vertical(
             Label("[b] Filter [/b]"),
             Rule(),
             Label("Job Name", classes="filter-type-label"),
-            Input(placeholder="Name prefix...", id="job_name_filter"),
+            Select([(mode, mode) for mode in NAME_MODES], value="prefix", allow_blank=False, id="name_mode_filter"),
+            Input(placeholder=NAME_MODES["prefix"], id="job_name_filter"),
             Label("Status", classes="filter-type-label"),
             SelectionList(
                 ("SUBMITTED", "SUBMITTED"),
@@ -42,17 +122,66 @@ class JobFilter(Static):
                 ("FAILED", "FAILED"),
                 id="status_filter",
             ),
+            Label("Created", classes="filter-type-label"),
+            Select(
+                [(label, window) for window, (label, _) in TIME_WINDOWS.items()],
+                value=self.time_window,
+                allow_blank=False,
+                id="time_window_filter",
+            ),
+            Vertical(
+                Input(placeholder="From, e.g. 2024-05-01 13:00", id="created_after_filter"),
+                Input(placeholder="To (optional)", id="created_before_filter"),
+                id="custom_time_range",
+            ),
             id="filter-vertical",
         )
 
     def send_filter_update(self) -> None:
-        filter_settings = FilterSettings(
-            job_name=self.query_one("#job_name_filter", Input).value,
-            statuses=[s for s in self.query_one("#status_filter", SelectionList).selected],
-        )
+        name_input = self.query_one("#job_name_filter", Input)
+        time_window = self.query_one("#time_window_filter", Select).value
 
+        created_after, created_before = time_window_start(time_window), None
+        if time_window == "custom":
+            invalid = False
+            bounds = []
+            for time_input in self.query_one("#custom_time_range").query(Input):
+                try:
+                    bounds.append(parse_time(time_input.value))
+                    time_input.remove_class("-invalid")
+                except ValueError:
+                    time_input.add_class("-invalid")
+                    invalid = True
+            if invalid:
+                return
+            created_after, created_before = bounds
+
+        try:
+            filter_settings = FilterSettings(
+                job_name=name_input.value,
+                statuses=[s for s in self.query_one("#status_filter", SelectionList).selected],
+                name_mode=self.query_one("#name_mode_filter", Select).value,
+                time_window=time_window,
+                created_after=created_after,
+                created_before=created_before,
+            )
+        except re.error:
+            name_input.add_class("-invalid")  # keep the last valid filter until the pattern is fixed
+            return
+
+        name_input.remove_class("-invalid")
         self.post_message(JobFilter.Changed(filter_settings))
 
+    def on_mount(self):
+        self.query_one("#custom_time_range").display = self.time_window == "custom"
+
+    def on_select_changed(self, event: Select.Changed):
+        if event.select.id == "name_mode_filter":
+            self.query_one("#job_name_filter", Input).placeholder = NAME_MODES[event.value]
+        elif event.select.id == "time_window_filter":
+            self.query_one("#custom_time_range").display = event.value == "custom"
+        self.send_filter_update()
+
     def on_selection_list_selected_changed(self, event: SelectionList.SelectedChanged):
         self.send_filter_update()
 
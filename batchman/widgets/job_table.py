@@ -1,44 +1,158 @@
+import dataclasses
 import json
-from dataclasses import dataclass
+import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Iterable
 
 from natsort import natsorted
+from rich.text import Text
 from textual import log, work
-from textual.coordinate import Coordinate
+from textual.geometry import Region, Size
 from textual.message import Message
 from textual.widgets import DataTable
+from textual.worker import get_current_worker
 
 from batchman.lib.batch import (
     UnauthorizedError,
-    get_array_child_jobs,
-    get_jobs,
+    get_array_child_jobs_page,
+    get_array_status_summary,
+    get_job_pages,
     get_jobs_details,
-    get_log_events,
     get_log_stream_name,
     kill_jobs,
 )
+from batchman.lib.cache import FINAL_STATUSES, JobDetailsCache, LogCache
+from batchman.lib.clone import ARRAY_INDEX_VARIABLE, clone_jobs, is_array_child
+from batchman.lib.export import export_jobs, get_export_format
+from batchman.lib.instrumentation import metrics
+from batchman.lib.job_index import JobIndex
+from batchman.lib.log_search import LogSearchTarget, search_logs
+from batchman.lib.stats import QueueStats
+from batchman.lib.triage import (
+    FailureGroup,
+    FailureTriageCache,
+    collect_failed_jobs,
+    group_failures,
+)
 from batchman.modals.confirmation_screen import ConfirmationScreen
+from batchman.modals.export_screen import ExportScreen
+from batchman.modals.failure_triage_screen import FailureTriageScreen
+from batchman.modals.log_search_screen import LogSearchScreen
 from batchman.modals.message_screen import MessageScreen
+from batchman.modals.progress_screen import ProgressScreen
+from batchman.modals.text_input_screen import TextInputScreen
 from batchman.modals.view_text_screen import (
     ViewTextScreen,
     ViewTextScreenWithSaveButton,
 )
-from batchman.widgets.job_filter import FilterSettings
+from batchman.widgets.job_filter import FilterSettings, time_window_start
+
+# details of jobs around the cursor are prefetched once the cursor rests for this many seconds...
+DETAILS_PREFETCH_DELAY = 0.1
+# ...when any job this close to the cursor isn't cached...
+DETAILS_PREFETCH_MARGIN = 10
+# ...for all jobs this close to the cursor, in one describe_jobs call
+DETAILS_PREFETCH_RADIUS = 50
+DETAILS_BATCH_SIZE = 100
+DETAILS_CACHE_SIZE = 10000
+# the clone progress bar is updated after every this many submitted jobs
+CLONE_PROGRESS_STEP = 10
+# children of array jobs are loaded in windows of this size...
+ARRAY_CHILD_WINDOW_SIZE = 100
+# ...and the next window is requested when the cursor gets this close to the last loaded child
+ARRAY_CHILD_PREFETCH_DISTANCE = 10
+# only a window of this many visible jobs around the viewport has rows in the DataTable (the scrollable area still
+# covers all visible jobs)...
+TABLE_WINDOW_SIZE = 500
+# ...which is moved when the viewport gets this close to its edge
+TABLE_WINDOW_MARGIN = 100
+
+COLUMNS = [
+    ("Selected", "selected"),
+    ("Job Name", "jobName"),
+    ("Job ID", "jobId"),
+    ("Created At", "createdAt"),
+    ("Status", "status"),
+]
 
 
 @dataclass
+class ArrayStatusBucket:
+    """Children of an array job with one status, loaded lazily in windows."""
+
+    status: str
+    size: int
+    children: list["JobRecord"] = field(default_factory=list)
+    next_token: str | None = None
+    exhausted: bool = False
+    loading: bool = False
+
+
+@dataclass(eq=False)  # records are compared by identity
 class JobRecord:
     job: dict
-    selected: bool
     is_array_job: bool
     is_expanded: bool = False
     parent_job: "JobRecord" = None
+    # set for the rows grouping children of an array job by status (these are not real jobs)
+    bucket: ArrayStatusBucket | None = None
+    # the cells of the table row, formatted when the job is first drawn
+    cells: tuple[Text, Text, Text, Text] | None = field(default=None, repr=False)
+
+    def is_descendant_of(self, job: "JobRecord") -> bool:
+        parent = self.parent_job
+        while parent is not None:
+            if parent is job:
+                return True
+            parent = parent.parent_job
+        return False
+
+    def formatted_cells(self) -> tuple[Text, Text, Text, Text]:
+        """Job name, job ID, creation time and status as shown in the table.
+
+        The cells are rich texts, so the DataTable doesn't parse markup every time it renders them. Rows of status
+        buckets change as their children are loaded, so only the cells of real jobs are cached.
+        """
+        if self.cells is not None:
+            return self.cells
+
+        cells = (
+            Text.from_markup(format_job_name(self), end=""),
+            Text(self.job["jobId"], end=""),
+            Text(utc_from_timestamp(self.job["createdAt"]), end=""),
+            Text(self.job["status"], end=""),
+        )
+        if self.bucket is None:
+            self.cells = cells
+        return cells
+
+
+def format_job_name(job: JobRecord) -> str:
+    job_name = job.job["jobName"]
+    if job.bucket is not None:  # children of an array job with one status
+        marker = "-" if job.is_expanded else "+"
+        loaded = f", {len(job.bucket.children)} loaded" if job.is_expanded else ""
+        return f"[b][yellow]|{marker}[/b][/yellow] {job.bucket.status} ({job.bucket.size} tasks{loaded})"
+    if job.is_array_job:
+        if job.parent_job is None:  # parent job
+            return f"[b][yellow]+[/b][/yellow] {job_name} ({job.job['arrayProperties']['size']} tasks)"
+        return f"[b][yellow]| |[/b][/yellow] {job_name}"  # child job
+    return job_name
 
 
 def utc_from_timestamp(timestamp: int) -> str:
     return datetime.fromtimestamp(float(timestamp) / 1000).strftime("%Y-%m-%d %H:%M:%S")
 
 
+def listed_time_range(created_after: int | None, created_before: int | None) -> tuple[int, int | None]:
+    """Creation times of the jobs listed by `get_job_pages` with these bounds, None meaning "until now"."""
+    if created_after is not None:
+        return created_after, None
+    return 0, created_before
+
+
 def inject_highlighted_job(fn):
     """Decorator to inject the currently highlighted job into the function arguments.
 
@@ -46,8 +160,8 @@ def inject_highlighted_job(fn):
     """
 
     def wrapper(self, *args, **kwargs):
-        index = self.cursor_row
-        if self.row_count > 0 and index is not None:
+        if self.row_count > 0 and self.cursor_row is not None:
+            index = self.cursor_index
             job_record = self.get_job_by_row(index)
             return fn(self, job_record, index, *args, **kwargs)
         else:
@@ -66,52 +180,321 @@ class JobTable(DataTable):
         super().__init__(*args, **kwargs)
         self.filter_settings = FilterSettings("", [])
         self.jobs = []
+        self.jobs_by_id: dict[str, JobRecord] = {}
+        self.job_index = JobIndex()  # finds the jobs passing the filter without scanning all of them
+        self.job_positions: dict[JobRecord, int] | None = {}  # positions in `self.jobs`, rebuilt lazily when None
+        self.visible_jobs: list[JobRecord] = []  # jobs passing the filter in table order
+        self.window_start = 0  # position in `visible_jobs` of the first row of the DataTable
+        self.moving_window = False
+        self.viewport_holds = 0  # while positive, the cursor isn't scrolled into view, see `move_window`
+        self.selected_job_ids: set[str] = set()
+        self.selection_anchor: str | None = None  # job ID where the last range selection starts
+        self.stats = QueueStats()
+        self.stats_jobs: dict[str, dict] = {}  # job summaries counted in `stats` by job ID
+        # jobs counted by the previous load which haven't been listed again yet, see `refresh_jobs`
+        self.stale_stats_jobs: dict[str, dict] = {}
         self.sorted_by = None
         self.sort_reversed = False
+        self.load_generation = 0  # incremented by every reload, see `update`
+        # creation times covered by the loaded jobs, (start, end) in ms with None for "until now"
+        self.loaded_range: tuple[int, int | None] = (0, None)
+        self.details_cache = JobDetailsCache(DETAILS_CACHE_SIZE)
+        self.details_prefetch_timer = None
+        self.failure_triage_cache = FailureTriageCache()
+        self.log_cache = LogCache()
 
     def on_mount(self):
         super().on_mount()
         self.cursor_type = "row"
-        self.add_columns("Selected", "Job Name", "Job ID", "Created At", "Status")
+        for label, key in COLUMNS:
+            self.add_column(label, key=key)
+        time_window = self.app.config.time_window
+        self.filter_settings = FilterSettings(
+            "", [], time_window=time_window, created_after=time_window_start(time_window)
+        )
         self.refresh_jobs()
 
-    @work(thread=True, exclusive=True, exit_on_error=False)
-    def update(self):
-        self.clear()
-        self.jobs.clear()
+    @work(thread=True, group="load", exclusive=True, exit_on_error=False)
+    def update(self, generation: int, created_after: int | None = None, created_before: int | None = None):
+        """Load the jobs of the queue created in a time range, handing them over to the UI thread page by page.
 
+        Every load is tagged with the generation it was started for. When a newer load starts (e.g. because the job
+        queue changed), the pagination of this one stops at the next page boundary and pages already in flight are
+        dropped by `_add_jobs_page`, so jobs of different loads never mix.
+        """
+        worker = get_current_worker()
         try:
-            for job in get_jobs(self.app.batch_client, self.app.config.job_queue_name):
-                visible = self.job_should_be_visible(job)
-                self.jobs.append(JobRecord(job=job, selected=False, is_array_job="arrayProperties" in job))
-                if visible:
-                    self.draw_row(self.jobs[-1])
-                    self.loading = False
-            self.app.notify("All jobs loaded", severity="information", timeout=1)
+            with metrics.timer("table.load"):
+                for page in get_job_pages(
+                    self.app.batch_client, self.app.config.job_queue_name, created_after, created_before
+                ):
+                    if worker.is_cancelled or generation != self.load_generation:
+                        metrics.increment("table.load.cancelled")
+                        return
+                    self.app.call_from_thread(self._add_jobs_page, generation, page)
+
+            if generation == self.load_generation:
+                self.app.notify("All jobs loaded", severity="information", timeout=1)
         except UnauthorizedError:
-            self.post_message(self.ErrorStateMessage("Unauthorized. Did you forget to login?"))
+            if generation == self.load_generation:
+                self.post_message(self.ErrorStateMessage("Unauthorized. Did you forget to login?"))
         except Exception as e:
-            self.post_message(self.ErrorStateMessage(f"Error loading jobs: {e}"))
+            if generation == self.load_generation:
+                self.post_message(self.ErrorStateMessage(f"Error loading jobs: {e}"))
         finally:
+            if generation == self.load_generation and not worker.is_cancelled:
+                # also after a failed load, so jobs which weren't listed again don't stay counted
+                self.app.call_from_thread(self._drop_stale_stats, generation)
+                self.app.call_from_thread(self._finish_loading, generation)
+
+    def _add_jobs_page(self, generation: int, page: list[dict]):
+        if generation != self.load_generation:
+            metrics.increment("table.load.stale_pages")
+            return  # a newer load has started since this page was requested
+
+        # jobs can be listed twice when the time window is widened
+        new_jobs = [job for job in page if job["jobId"] not in self.jobs_by_id]
+        for job in new_jobs:
+            self.add_job(JobRecord(job=job, is_array_job="arrayProperties" in job))
+            if self.job_should_be_visible(job):
+                self.draw_row(self.jobs[-1])
+        self.update_virtual_size()
+        self._update_stats(new_jobs)
+        self.loading = False
+
+    def _update_stats(self, jobs: list[dict]):
+        """Count listed jobs, replacing the versions counted by the previous load (e.g. with an older status)."""
+        added, old_jobs, new_jobs = [], [], []
+        for job in jobs:
+            previous = self.stale_stats_jobs.pop(job["jobId"], None)
+            if previous is None:
+                added.append(job)
+            elif previous != job:
+                old_jobs.append(previous)
+                new_jobs.append(job)
+            self.stats_jobs[job["jobId"]] = job
+
+        self.stats.add(added)
+        if new_jobs:
+            self.stats.replace(old_jobs, new_jobs)
+
+    def _drop_stale_stats(self, generation: int):
+        """Stop counting the jobs of the previous load which the finished (or failed) load didn't list again."""
+        if generation == self.load_generation:
+            self.stats.remove(list(self.stale_stats_jobs.values()))
+            self.stale_stats_jobs = {}
+
+    @work(thread=True, group="load_range", exit_on_error=False)
+    def load_time_range(self, generation: int, created_after: int | None, created_before: int | None):
+        """Load jobs created in a time range on top of the already loaded ones, e.g. when the time window is widened."""
+        worker = get_current_worker()
+        try:
+            with metrics.timer("table.load_range"):
+                for page in get_job_pages(
+                    self.app.batch_client, self.app.config.job_queue_name, created_after, created_before
+                ):
+                    if worker.is_cancelled or generation != self.load_generation:
+                        return
+                    self.app.call_from_thread(self._add_jobs_page, generation, page)
+        except Exception as e:
+            if generation == self.load_generation:
+                self.app.notify(f"Error loading jobs: {e}", severity="error")
+
+    def load_missing_time_range(self):
+        """Fetch the jobs which the time window of the filter includes but which weren't loaded yet.
+
+        `list_jobs` accepts a single filter, so the missing range is fetched with either a lower or an upper bound
+        on the creation time; jobs which are already loaded are skipped.
+        """
+        loaded_start, loaded_end = self.loaded_range
+        start = self.filter_settings.created_after or 0
+        end = self.filter_settings.created_before
+
+        missing_older = start < loaded_start
+        missing_newer = loaded_end is not None and (end is None or end > loaded_end)
+        if not missing_older and not missing_newer:
+            return  # narrowing the window only filters the loaded jobs
+
+        queries = []
+        if missing_older and start > 0:
+            queries.append((start, None))  # also covers the newer jobs
+        else:
+            if missing_older:
+                queries.append((None, loaded_start))
+            if missing_newer:
+                queries.append((loaded_end, None))
+
+        for created_after, created_before in queries:
+            self.extend_loaded_range(created_after, created_before)
+            self.load_time_range(self.load_generation, created_after, created_before)
+
+    def extend_loaded_range(self, created_after: int | None, created_before: int | None):
+        """Record that the jobs listed with these bounds are (being) loaded."""
+        query_start, query_end = listed_time_range(created_after, created_before)
+        loaded_start, loaded_end = self.loaded_range
+        self.loaded_range = (
+            min(loaded_start, query_start),
+            None if loaded_end is None or query_end is None else max(loaded_end, query_end),
+        )
+
+    def _finish_loading(self, generation: int):
+        if generation == self.load_generation:
             self.loading = False
             self.focus()
 
+    def add_job(self, job: JobRecord):
+        self.jobs.append(job)
+        self.jobs_by_id[job.job["jobId"]] = job
+        self.job_index.add([job])
+        if self.job_positions is not None:
+            self.job_positions[job] = len(self.jobs) - 1
+
+    def get_job_positions(self) -> dict[JobRecord, int]:
+        if self.job_positions is None:
+            self.job_positions = {job: position for position, job in enumerate(self.jobs)}
+        return self.job_positions
+
+    def clear(self, columns: bool = False):
+        self.visible_jobs = []
+        self.window_start = 0
+        return super().clear(columns)
+
     def draw_row(self, job: JobRecord):
-        job_name = job.job["jobName"]
-        if job.is_array_job:
-            if job.parent_job is None:  # parent job
-                job_name = f"[b][yellow]+[/b][/yellow] {job_name} ({job.job['arrayProperties']['size']} tasks)"
-            else:  # child job
-                job_name = f"[b][yellow]|[/b][/yellow] {job_name}"
-
-        self.add_row(
-            "X" if job.selected else " ",
-            job_name,
-            job.job["jobId"],
-            # convert times to UTC
-            utc_from_timestamp(job.job["createdAt"]),
-            job.job["status"],
-        )
+        """Append a job to the table, it only gets a DataTable row if it falls into the window."""
+        self.visible_jobs.append(job)
+        if len(self.visible_jobs) <= self.window_start + TABLE_WINDOW_SIZE:
+            self.add_job_row(job)
+
+    def add_job_row(self, job: JobRecord):
+        metrics.increment("table.rows_drawn")
+        job_id = job.job["jobId"]
+        self.add_row("X" if job_id in self.selected_job_ids else " ", *job.formatted_cells(), key=job_id)
+
+    @property
+    def cursor_index(self) -> int:
+        """Position of the highlighted job in `visible_jobs` (`cursor_row` is relative to the window)."""
+        return self.window_start + self.cursor_row
+
+    def window_start_around(self, index: int) -> int:
+        """Start of the window centered on a position in `visible_jobs`."""
+        return max(0, min(index - TABLE_WINDOW_SIZE // 2, len(self.visible_jobs) - TABLE_WINDOW_SIZE))
+
+    def materialize_window(self, start: int):
+        """Replace the rows of the DataTable with the visible jobs from `start` on, keeping the scroll position."""
+        with metrics.timer("table.materialize_window"):
+            scroll_y, scroll_target_y = self.scroll_y, self.scroll_target_y
+            super().clear()
+            self.window_start = start
+            for job in self.visible_jobs[start : start + TABLE_WINDOW_SIZE]:
+                self.add_job_row(job)
+            self.update_virtual_size()
+            # clearing the DataTable scrolls it to the top, but the rows are laid out at their positions anyway
+            self.scroll_y, self.scroll_target_y = scroll_y, scroll_target_y
+
+    def update_virtual_size(self):
+        """Make the scrollable area as tall as all visible jobs, not just the rows in the window."""
+        self.virtual_size = Size(self.virtual_size.width, self._total_row_height + self._header_height)
+
+    @property
+    def _header_height(self) -> int:
+        return self.header_height if self.show_header else 0
+
+    # The DataTable only holds the rows of the window, but lays them out at their positions in `visible_jobs`, so the
+    # scrollbar covers all visible jobs. All rows are one line high.
+    @property
+    def _total_row_height(self) -> int:
+        return len(self.visible_jobs)
+
+    def _get_offsets(self, y: int):
+        if y >= self._header_height:
+            y -= self.window_start
+            if y < self._header_height:
+                raise LookupError(f"Line {y + self.window_start} is above the window")
+        return super()._get_offsets(y)
+
+    def _get_row_region(self, row_index: int) -> Region:
+        return super()._get_row_region(row_index).translate((0, self.window_start))
+
+    def _get_cell_region(self, coordinate) -> Region:
+        return super()._get_cell_region(coordinate).translate((0, self.window_start))
+
+    def move_window(self, start: int, cursor_index: int, top_index: int | None = None):
+        """Move the window to `start`, keeping the cursor on the job at `cursor_index` in `visible_jobs`.
+
+        The viewport is scrolled to show the job at `top_index` on top, or just to show the cursor if it's None.
+        """
+        self.moving_window = True
+        if start != self.window_start:
+            self.materialize_window(start)
+        if top_index is None:
+            self.move_cursor(row=cursor_index - start, animate=False, scroll=False)
+            super()._scroll_cursor_into_view()
+        else:
+            # the DataTable scrolls a moved cursor into view once it's idle, which must not move the viewport here
+            self.viewport_holds += 1
+            self.move_cursor(row=cursor_index - start, animate=False, scroll=False)
+            if top_index != round(self.scroll_y):
+                self.scroll_to(y=top_index, animate=False, immediate=True)
+            self.call_after_refresh(self._release_viewport)
+        self.moving_window = False
+
+    def _release_viewport(self):
+        self.viewport_holds -= 1
+
+    def _scroll_cursor_into_view(self, animate: bool = False) -> None:
+        if not self.viewport_holds:
+            super()._scroll_cursor_into_view(animate)
+
+    def move_cursor_to_index(self, index: int, scroll: bool = True):
+        """Move the cursor to a position in `visible_jobs`, moving the window there first if needed."""
+        if self.window_start <= index < self.window_start + self.row_count:
+            self.move_cursor(row=index - self.window_start, animate=False, scroll=scroll)
+        else:
+            self.move_window(self.window_start_around(index), index)
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if self.moving_window or self.row_count == 0:
+            return
+
+        # move the window once the viewport gets close to its edge (or jumps elsewhere, e.g. with the scrollbar)
+        top = round(new_value)  # position in `visible_jobs` of the first job in the viewport
+        height = self.scrollable_content_region.height
+        if (top < self.window_start + TABLE_WINDOW_MARGIN and self.window_start > 0) or (
+            top + height > self.window_start + self.row_count - TABLE_WINDOW_MARGIN
+            and self.window_start + self.row_count < len(self.visible_jobs)
+        ):
+            start = self.window_start_around(top + height // 2)
+            cursor_index = min(max(self.cursor_index, start), start + TABLE_WINDOW_SIZE - 1)
+            self.move_window(start, cursor_index, top)
+
+    def action_page_down(self) -> None:
+        self.move_page(1)
+
+    def action_page_up(self) -> None:
+        self.move_page(-1)
+
+    def move_page(self, direction: int):
+        """Move the cursor and the viewport by a page, counted in `visible_jobs` as scrolling may move the window."""
+        if not self.visible_jobs:
+            return
+
+        self._set_hover_cursor(False)
+        height = self.scrollable_content_region.height - self._header_height
+        index = min(max(self.cursor_index + direction * height, 0), len(self.visible_jobs) - 1)
+        self.scroll_relative(y=direction * height, animate=False, force=True, immediate=True)
+        self.move_cursor_to_index(index, scroll=False)
+
+    def action_scroll_top(self) -> None:
+        if self.window_start > 0:
+            self.move_window(0, 0)
+        super().action_scroll_top()
+
+    def action_scroll_bottom(self) -> None:
+        start = self.window_start_around(len(self.visible_jobs) - 1)
+        if start != self.window_start:
+            self.move_window(start, len(self.visible_jobs) - 1)
+        super().action_scroll_bottom()
 
     def on_job_table_error_state_message(self, message):
         self.app.push_screen(MessageScreen(message.message, fatal=True))
@@ -119,106 +502,335 @@ class JobTable(DataTable):
     def job_should_be_visible(self, job: dict) -> bool:
         return self.filter_settings.job_matches(job)
 
+    def matching_jobs(self) -> list[JobRecord]:
+        """Jobs passing the filter in table order, looked up in the job index when the filter allows it."""
+        candidates = self.job_index.candidates(
+            self.filter_settings.name_prefix,
+            self.filter_settings.statuses,
+            self.filter_settings.created_after,
+            self.filter_settings.created_before,
+        )
+        if candidates is None:
+            if not self.filter_settings.job_name:
+                return list(self.jobs)  # nothing to filter by
+            return [job for job in self.jobs if self.job_should_be_visible(job.job)]
+
+        metrics.increment("table.filter_candidates", len(candidates))
+        positions = self.get_job_positions()
+        return sorted((job for job in candidates if self.job_should_be_visible(job.job)), key=positions.__getitem__)
+
     def redraw_rows(self):
-        self.clear()
-        for job in self.jobs:
-            if self.job_should_be_visible(job.job):
-                self.draw_row(job)
+        with metrics.timer("table.redraw_rows", rows=len(self.jobs)):
+            self.clear()
+            self.visible_jobs = self.matching_jobs()
+            self.materialize_window(0)
 
     def get_job_by_row(self, index: int) -> JobRecord:
-        job_id_in_row = self.get_cell_at(Coordinate(index, 2))
-
-        for job in self.jobs:
-            if job.job["jobId"] == job_id_in_row:
-                return job
+        if not 0 <= index < len(self.visible_jobs):
+            raise ValueError(f"Row {index} does not exist")
 
-        raise ValueError(f"Job with ID {job_id_in_row} not found")
+        return self.visible_jobs[index]
 
     def get_job_index(self, job_id: str) -> int:
-        # note that this assumes identical zero-based indexing of rows in the DataTable
-        for index, job in enumerate(self.jobs):
-            if job.job["jobId"] == job_id:
-                return index
+        """Return the position of the job in `visible_jobs`."""
+        try:
+            return self.visible_jobs.index(self.jobs_by_id[job_id])
+        except (KeyError, ValueError):
+            raise ValueError(f"Job with ID {job_id} not found") from None
 
-        raise ValueError(f"Job with ID {job_id} not found")
+    def set_selected(self, job_ids: Iterable[str], selected: bool):
+        """Select or deselect jobs, updating only the cells which changed."""
+        changed = []
+        for job_id in job_ids:
+            if self.jobs_by_id[job_id].bucket is not None:
+                continue  # status buckets of array jobs can't be selected
+            if selected and job_id not in self.selected_job_ids:
+                self.selected_job_ids.add(job_id)
+                changed.append(job_id)
+            elif not selected and job_id in self.selected_job_ids:
+                self.selected_job_ids.discard(job_id)
+                changed.append(job_id)
+
+        new_value = "X" if selected else " "
+        for job_id in changed:
+            if job_id in self.rows:  # only jobs in the window have a row
+                self.update_cell(job_id, "selected", new_value)
+
+        metrics.increment("table.selection_cells_updated", len(changed))
 
     @inject_highlighted_job
     def toggle_selected(self, job_record: JobRecord, index: int):
-        job_record.selected = not job_record.selected
+        job_id = job_record.job["jobId"]
+        self.set_selected([job_id], job_id not in self.selected_job_ids)
+        self.selection_anchor = job_id
 
-        new_value = "X" if job_record.selected else " "
-        self.update_cell_at(Coordinate(index, 0), new_value)
+    @inject_highlighted_job
+    def select_range(self, job_record: JobRecord, index: int):
+        """Select all rows between the last toggled row and the highlighted row."""
+        try:
+            anchor_index = self.get_job_index(self.selection_anchor)
+        except ValueError:
+            anchor_index = index
+
+        start, end = sorted([anchor_index, index])
+        self.set_selected([job.job["jobId"] for job in self.visible_jobs[start : end + 1]], True)
+        self.selection_anchor = job_record.job["jobId"]
 
     @inject_highlighted_job
     def toggle_expand_array_job(self, job: JobRecord, index: int):
-        if job.is_array_job:
+        if job.bucket is not None:
+            if job.is_expanded:
+                self.collapse_array_job(index)
+            else:
+                job.is_expanded = True
+                self.request_array_children(job)
+        elif job.is_array_job:
             if job.parent_job:
                 self.collapse_array_job(self.get_job_index(job.parent_job.job["jobId"]))
             elif job.is_expanded:
                 self.collapse_array_job(index)
             else:
-                self.app.notify(f"Expanding array job {job.job['jobName']}, hang tight...", severity="information")
-                self.expand_array_job(index)
+                self.expand_array_job(job)
         else:
             self.app.notify("Can only expand array jobs", severity="warning")
 
     def collapse_array_job(self, index: int):
         job = self.get_job_by_row(index)
-        self.jobs = [j for j in self.jobs if j.parent_job != job]
+        descendants = [j for j in self.jobs if j.is_descendant_of(job)]
+        descendant_ids = [j.job["jobId"] for j in descendants]
+        self.set_selected(descendant_ids, False)
+        for descendant_id in descendant_ids:
+            del self.jobs_by_id[descendant_id]
+        self.jobs = [j for j in self.jobs if not j.is_descendant_of(job)]
+        self.job_index.remove(descendants)
+        self.job_positions = None
         job.is_expanded = False
+        if job.bucket is not None:
+            job.bucket.children = []
+            job.bucket.next_token = None
+            job.bucket.exhausted = False
         self.redraw_rows()
-        self.cursor_coordinate = Coordinate(index, 0)
+        self.move_cursor_to_index(index)
 
-    @work(thread=True, exclusive=True)
-    async def expand_array_job(self, index: int):
-        job = self.get_job_by_row(index)
+    def insert_jobs_after(self, job: JobRecord, new_jobs: list[JobRecord]):
+        position = self.get_job_positions()[job]
+        self.jobs = self.jobs[: position + 1] + new_jobs + self.jobs[position + 1 :]
+        self.jobs_by_id.update((new_job.job["jobId"], new_job) for new_job in new_jobs)
+        self.job_index.add(new_jobs)
+        self.job_positions = None
+
+    def redraw_rows_keeping_cursor(self):
+        if not self.row_count:
+            self.redraw_rows()
+            return
+
+        highlighted_job_id = self.get_job_by_row(self.cursor_index).job["jobId"]
+        cursor_offset = self.cursor_index - round(self.scroll_y)  # rows between the top of the viewport and the cursor
+        self.redraw_rows()
+        try:
+            index = self.get_job_index(highlighted_job_id)
+        except ValueError:
+            return
+        self.move_window(self.window_start_around(index), index, max(0, index - cursor_offset))
 
-        child_jobs = natsorted(get_array_child_jobs(self.app.batch_client, job.job), key=lambda x: x["jobId"])
+    @work(thread=True, group="array", exit_on_error=False)
+    def expand_array_job(self, job: JobRecord):
+        """Show the children of an array job grouped by status, without listing any of them yet."""
+        # the details of the highlighted job are usually prefetched, and unlike the job summary carry the status summary
+        job_details = self.details_cache.get(job.job["jobArn"]) or job.job
+        try:
+            status_summary = get_array_status_summary(self.app.batch_client, job_details)
+        except Exception as e:
+            self.app.call_from_thread(self.app.notify, f"Error expanding array job: {e}", severity="error")
+            return
+
+        self.app.call_from_thread(self._show_array_status_buckets, job, status_summary)
+
+    def _show_array_status_buckets(self, job: JobRecord, status_summary: dict[str, int]):
+        # after a reload, a new record with the same job ID replaces this one
+        if job.is_expanded or self.jobs_by_id.get(job.job["jobId"]) is not job:
+            return  # expanded twice or the table was reloaded in the meantime
+
+        buckets = []
+        for status, size in status_summary.items():
+            if size > 0:
+                bucket_job = {
+                    "jobArn": job.job["jobArn"],
+                    "jobId": f"{job.job['jobId']}#{status}",
+                    "jobName": job.job["jobName"],
+                    "createdAt": job.job["createdAt"],
+                    "status": status,
+                }
+                bucket = ArrayStatusBucket(status=status, size=size)
+                buckets.append(JobRecord(job=bucket_job, is_array_job=True, parent_job=job, bucket=bucket))
+
+        self.insert_jobs_after(job, buckets)
+        job.is_expanded = True
+        self.redraw_rows_keeping_cursor()
+
+    def request_array_children(self, bucket_job: JobRecord):
+        """Start loading the next window of children of an array job, unless it's already loading."""
+        bucket = bucket_job.bucket
+        if bucket.loading or bucket.exhausted:
+            return
+
+        bucket.loading = True
+        self.load_array_children(bucket_job)
+
+    @work(thread=True, group="array", exit_on_error=False)
+    def load_array_children(self, bucket_job: JobRecord):
+        """Load the next window of children of an array job with the status of the bucket."""
+        bucket = bucket_job.bucket
+        try:
+            child_jobs, next_token = get_array_child_jobs_page(
+                self.app.batch_client,
+                bucket_job.parent_job.job,
+                bucket.status,
+                ARRAY_CHILD_WINDOW_SIZE,
+                bucket.next_token,
+            )
+        except Exception as e:
+            bucket.loading = False
+            self.app.call_from_thread(self.app.notify, f"Error loading array job children: {e}", severity="error")
+            return
 
-        self.jobs = (
-            self.jobs[: index + 1]
-            + [JobRecord(job=child_job, selected=False, is_array_job=True, parent_job=job) for child_job in child_jobs]
-            + self.jobs[index + 1 :]
+        self.app.call_from_thread(self._show_array_children, bucket_job, child_jobs, next_token)
+
+    def _show_array_children(self, bucket_job: JobRecord, child_jobs: list[dict], next_token: str | None):
+        bucket_job.bucket.loading = False
+        if not bucket_job.is_expanded or self.jobs_by_id.get(bucket_job.job["jobId"]) is not bucket_job:
+            return  # collapsed or reloaded in the meantime
+
+        bucket = bucket_job.bucket
+        child_records = [
+            JobRecord(job=child_job, is_array_job=True, parent_job=bucket_job)
+            for child_job in natsorted(child_jobs, key=lambda x: x["jobId"])
+            if child_job["jobId"] not in self.jobs_by_id
+        ]
+
+        self.insert_jobs_after(bucket.children[-1] if bucket.children else bucket_job, child_records)
+        bucket.children.extend(child_records)
+        bucket.next_token = next_token
+        bucket.exhausted = next_token is None
+        self.redraw_rows_keeping_cursor()
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted):
+        if event.cursor_row != self.cursor_row or not 0 <= event.cursor_row < self.row_count:
+            return  # the cursor or the window moved in the meantime
+
+        # wait until the cursor stops moving before prefetching details, so scrolling doesn't fire a request per row
+        if self.details_prefetch_timer is not None:
+            self.details_prefetch_timer.stop()
+        self.details_prefetch_timer = self.set_timer(DETAILS_PREFETCH_DELAY, self.prefetch_details_around_cursor)
+
+        # load more children of an array job when the cursor approaches the last loaded one
+
+        index = self.cursor_index
+        job = self.visible_jobs[index]
+        bucket_job = job.parent_job if job.parent_job is not None and job.parent_job.bucket is not None else None
+        if bucket_job is None or bucket_job.bucket.exhausted or bucket_job.bucket.loading:
+            return
+
+        if bucket_job.bucket.children[-1] in self.visible_jobs[index : index + ARRAY_CHILD_PREFETCH_DISTANCE]:
+            self.request_array_children(bucket_job)
+
+    def _job_arns_around_cursor(self, radius: int) -> list[str]:
+        """ARNs of the jobs within `radius` rows of the cursor, nearest first."""
+        cursor = self.cursor_index
+        rows = sorted(
+            range(max(0, cursor - radius), min(len(self.visible_jobs), cursor + radius + 1)),
+            key=lambda row: abs(row - cursor),
         )
-        self.jobs[index].is_expanded = True
+        # status buckets of array jobs share the ARN of their parent
+        return list(dict.fromkeys(self.visible_jobs[row].job["jobArn"] for row in rows))
 
-        self.redraw_rows()
-        self.cursor_coordinate = Coordinate(index, 0)
-        self.app.notify(f"Array job {job.job['jobName']} expanded.", severity="information")
+    def prefetch_details_around_cursor(self):
+        self.details_prefetch_timer = None
+        if self.cursor_row is None or not 0 <= self.cursor_index < len(self.visible_jobs):
+            return
+
+        nearby = self._job_arns_around_cursor(DETAILS_PREFETCH_MARGIN)
+        if all(self.details_cache.get(job_arn) is not None for job_arn in nearby):
+            return
+
+        job_arns = self.details_cache.claim_missing(self._job_arns_around_cursor(DETAILS_PREFETCH_RADIUS))
+        if job_arns:
+            self.prefetch_details(job_arns[:DETAILS_BATCH_SIZE])
+            self.details_cache.release(job_arns[DETAILS_BATCH_SIZE:])
+
+    @work(thread=True, group="details", exit_on_error=False)
+    def prefetch_details(self, job_arns: list[str]):
+        try:
+            self.details_cache.put_many(get_jobs_details(self.app.batch_client, job_arns))
+            metrics.increment("details.prefetched", len(job_arns))
+        except Exception:
+            metrics.increment("details.prefetch_errors")  # not fatal, the details are fetched again when opened
+        finally:
+            self.details_cache.release(job_arns)
+
+    def with_job_details(self, job_record: JobRecord, callback):
+        """Call `callback(job_record, job_details)` with cached details, or once they're fetched in the background."""
+        job_details = self.details_cache.get(job_record.job["jobArn"])
+        if job_details is not None:
+            metrics.increment("details.cache_hits")
+            callback(job_record, job_details)
+        else:
+            metrics.increment("details.cache_misses")
+            self.fetch_details(job_record, callback)
+
+    @work(thread=True, group="details", exit_on_error=False)
+    def fetch_details(self, job_record: JobRecord, callback):
+        try:
+            jobs_details = get_jobs_details(self.app.batch_client, [job_record.job["jobArn"]])
+        except Exception as e:
+            self.app.notify(f"Error fetching job details: {e}", severity="error")
+            return
+
+        if not jobs_details:
+            self.app.notify("Job not found", severity="warning")
+            return
+
+        self.details_cache.put_many(jobs_details)
+        self.app.call_from_thread(callback, job_record, jobs_details[0])
 
     # # This is usually not desirable because it's too easy to accidentally select a row
     # def on_data_table_row_selected(self, event: DataTable.RowSelected):
     #     self.toggle_selected(event.cursor_row)
 
     def select_all(self):
-        for job in self.jobs:
-            if self.job_should_be_visible(job.job):
-                job.selected = True
-
-        self.redraw_rows()
+        self.set_selected([job.job["jobId"] for job in self.visible_jobs], True)
 
     def clear_selection(self):
-        for job in self.jobs:
-            job.selected = False
+        self.set_selected(list(self.selected_job_ids), False)
 
-        self.redraw_rows()
+    def invert_selection(self):
+        visible_ids = [job.job["jobId"] for job in self.visible_jobs]
+        to_select = [job_id for job_id in visible_ids if job_id not in self.selected_job_ids]
+        self.set_selected([job_id for job_id in visible_ids if job_id in self.selected_job_ids], False)
+        self.set_selected(to_select, True)
 
     @inject_highlighted_job
     def view_job_details(self, job_record: JobRecord, index: int):
-        job_details = get_jobs_details(self.app.batch_client, [job_record.job["jobArn"]])[0]
+        self.with_job_details(job_record, self._show_job_details)
+
+    def _show_job_details(self, job_record: JobRecord, job_details: dict):
         serialized_details = json.dumps(job_details, ensure_ascii=False, indent=4)
         self.app.push_screen(ViewTextScreen(text=serialized_details, language="json"))
 
     @inject_highlighted_job
     def view_job_logs(self, job_record: JobRecord, index: int):
-        job_details = get_jobs_details(self.app.batch_client, [job_record.job["jobArn"]])[0]
+        self.with_job_details(job_record, self._show_job_logs)
+
+    def _show_job_logs(self, job_record: JobRecord, job_details: dict):
         job_name = job_details["jobName"]
         log_stream_name = get_log_stream_name(job_details)
 
         if log_stream_name:
             self.app.push_screen(
                 ViewTextScreenWithSaveButton(
-                    text_generator_fn=lambda: get_log_events(log_stream_name),
+                    text_generator_fn=lambda: self.log_cache.iter_lines(
+                        self.app.logs_client, log_stream_name, job_details["status"] in FINAL_STATUSES
+                    ),
                     default_file_name=f"{job_name}.log",
                 )
             )
@@ -228,19 +840,54 @@ class JobTable(DataTable):
         else:
             self.app.notify("No logs available", severity="warning")
 
-    def refresh_jobs(self):
-        if not self.loading:
-            self.loading = True
-            # the exclusive flag doesn't really work for some reason so we "lock" by checking the loading flag
-            self.update()
+    def refresh_jobs(self, new_source: bool = False):
+        """Reload all jobs in the time window of the filter, abandoning any load still in progress.
+
+        `new_source` means the job queue or region has changed, so the statistics of the old jobs are dropped at once
+        instead of being updated as the jobs are listed again.
+        """
+        if self.filter_settings.time_window != "custom":
+            # move relative time windows to the current time
+            self.filter_settings = dataclasses.replace(
+                self.filter_settings, created_after=time_window_start(self.filter_settings.time_window)
+            )
+        created_after, created_before = self.filter_settings.created_after, self.filter_settings.created_before
+        if created_after is not None:
+            created_before = None  # only one filter is allowed, the upper bound is applied locally
+
+        self.load_generation += 1
+        self.loaded_range = listed_time_range(created_after, created_before)
+        self.clear()
+        self.jobs.clear()
+        self.jobs_by_id.clear()
+        self.job_index.clear()
+        self.job_positions = {}
+        self.selected_job_ids.clear()
+        if new_source:
+            self.stats.clear()
+            self.stale_stats_jobs = {}
+        else:
+            # the statistics are updated as the jobs are listed again instead of starting from zero
+            self.stale_stats_jobs.update(self.stats_jobs)
+        self.stats_jobs = {}
+        self.loading = True
+        self.update(self.load_generation, created_after, created_before)
 
     def _get_selected_jobs(self, select_highlighted=False):
-        selected_jobs = [job.job for job in self.jobs if job.selected and self.job_should_be_visible(job.job)]
+        # only jobs which are currently visible count as selected; status buckets of array jobs are not real jobs
+        selected_jobs = [
+            job.job for job in self.visible_jobs if job.bucket is None and job.job["jobId"] in self.selected_job_ids
+        ]
         if not selected_jobs:
             if self.row_count > 0 and self.cursor_row is not None and select_highlighted:
-                highlighted_job = self.get_job_by_row(self.cursor_row)
-                highlighted_job.selected = True
-                self.redraw_rows()
+                highlighted_job = self.get_job_by_row(self.cursor_index)
+                if highlighted_job.bucket is not None:
+                    self.app.notify(
+                        "Status groups of array jobs can't be selected, expand them to select their jobs",
+                        severity="warning",
+                    )
+                    return None
+                self.set_selected([highlighted_job.job["jobId"]], True)
                 selected_jobs = [highlighted_job.job]
             else:
                 self.app.notify("No jobs selected", severity="warning")
@@ -249,28 +896,325 @@ class JobTable(DataTable):
 
     def kill_selected_jobs(self):
         selected_jobs = self._get_selected_jobs(select_highlighted=True)
-        if selected_jobs is None:
-            return
+        if selected_jobs is not None:
+            self.confirm_kill_jobs(selected_jobs, "selected")
+
+    def confirm_kill_jobs(self, selected_jobs: list[dict], description: str):
+        """Kill jobs after confirmation."""
 
         def run_kill_jobs():
-            self.run_worker(kill_jobs(self.app.batch_client, [job["jobId"] for job in selected_jobs]), thread=True)
-            self.refresh_jobs()
+            self.details_cache.invalidate([job["jobArn"] for job in selected_jobs])
+            self.execute_kill_jobs([job["jobId"] for job in selected_jobs])
 
         self.app.push_screen(
             ConfirmationScreen(
-                f"Kill {len(selected_jobs)} selected jobs?",
+                f"Kill {len(selected_jobs)} {description} jobs?",
                 run_kill_jobs,
                 selected_jobs,
             )
         )
 
+    @work(thread=True, group="kill", exit_on_error=False)
+    def execute_kill_jobs(self, job_ids: list[str]):
+        start = time.perf_counter()
+        errors = kill_jobs(self.app.batch_client, job_ids)
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            job_id, error = next(iter(errors.items()))
+            self.app.notify(
+                f"Failed to kill {len(errors)} of {len(job_ids)} jobs (e.g. {job_id}: {error})", severity="error"
+            )
+        else:
+            self.app.notify(
+                f"Killed {len(job_ids)} jobs in {elapsed:.1f} s ({len(job_ids) / elapsed:.0f} jobs/s)",
+                severity="information",
+            )
+        self.app.call_from_thread(self.refresh_jobs)
+
     def clone_selected_jobs(self):
-        self.app.notify("Cloning jobs is not yet supported", severity="warning")
+        selected_jobs = self._get_selected_jobs(select_highlighted=True)
+        if selected_jobs is not None:
+            self.confirm_clone_jobs(selected_jobs, "selected")
+
+    def confirm_clone_jobs(self, selected_jobs: list[dict], description: str):
+        """Resubmit jobs, asking for overrides first."""
+
+        def run_clone_jobs(overrides_text: str):
+            try:
+                overrides = json.loads(overrides_text) if overrides_text.strip() else {}
+            except json.JSONDecodeError as e:
+                self.app.notify(f"Invalid overrides: {e}", severity="error")
+                return
+
+            if not isinstance(overrides, dict):
+                self.app.notify("Overrides must be a JSON object", severity="error")
+                return
+
+            progress_screen = ProgressScreen(f"Cloning {len(selected_jobs)} jobs...", total=len(selected_jobs))
+            self.app.push_screen(progress_screen)
+            self.execute_clone_jobs(
+                [job["jobArn"] for job in selected_jobs], n_array_children, overrides, progress_screen
+            )
+
+        n_array_children = sum(map(is_array_child, selected_jobs))
+        array_children_note = (
+            f" {n_array_children} of them are children of array jobs and are resubmitted as standalone jobs, with their"
+            f" array index in {ARRAY_INDEX_VARIABLE} instead of AWS_BATCH_JOB_ARRAY_INDEX."
+            if n_array_children
+            else ""
+        )
+        self.app.push_screen(
+            TextInputScreen(
+                f"Clone {len(selected_jobs)} {description} jobs?{array_children_note}"
+                " Optionally override submit_job fields (JSON object):",
+                run_clone_jobs,
+                "{}",
+            )
+        )
+
+    @work(thread=True, group="clone", exit_on_error=False)
+    def execute_clone_jobs(
+        self, job_arns: list[str], n_array_children: int, overrides: dict, progress_screen: ProgressScreen
+    ):
+        def report_progress(finished: int, total: int):
+            if finished % CLONE_PROGRESS_STEP == 0 or finished == total:
+                self.app.call_from_thread(progress_screen.update_progress, finished, total)
+
+        start = time.perf_counter()
+        try:
+            cloned, errors = clone_jobs(self.app.batch_client, job_arns, overrides, report_progress)
+        except Exception as e:
+            self.app.call_from_thread(progress_screen.dismiss)
+            self.app.notify(f"Error cloning jobs: {e}", severity="error")
+            return
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            self.app.notify(f"Failed to clone {len(errors)} of {len(job_arns)} jobs", severity="error")
+        else:
+            self.app.notify(
+                f"Cloned {len(cloned)} jobs in {elapsed:.1f} s ({len(cloned) / elapsed:.0f} jobs/s)",
+                severity="information",
+            )
+
+        result = {"cloned": cloned, "errors": errors}
+        if n_array_children:
+            result["note"] = (
+                f"{n_array_children} children of array jobs were resubmitted as standalone jobs,"
+                f" with their array index in {ARRAY_INDEX_VARIABLE} instead of AWS_BATCH_JOB_ARRAY_INDEX"
+            )
+        report = json.dumps(result, ensure_ascii=False, indent=4)
+        self.app.call_from_thread(self._show_clone_report, progress_screen, report)
+
+    def _show_clone_report(self, progress_screen: ProgressScreen, report: str):
+        progress_screen.dismiss()
+        self.app.push_screen(
+            ViewTextScreenWithSaveButton(text=report, language="json", default_file_name="cloned_jobs.json")
+        )
+        self.refresh_jobs()
+
+    def export_jobs(self):
+        """Export the selected jobs, or all visible jobs if none are selected."""
+        selected_jobs = [job.job for job in self.visible_jobs if job.job["jobId"] in self.selected_job_ids]
+        jobs = selected_jobs or [job.job for job in self.visible_jobs if job.bucket is None]
+        if not jobs:
+            self.app.notify("No jobs to export", severity="warning")
+            return
+
+        def run_export_jobs(path: str, with_details: bool):
+            try:
+                get_export_format(path)
+            except ValueError as e:
+                self.app.notify(str(e), severity="error")
+                return
+
+            progress_screen = ProgressScreen(f"Exporting {len(jobs)} jobs to {path}...", total=len(jobs))
+            self.app.push_screen(progress_screen)
+            self.execute_export_jobs(jobs, path, with_details, progress_screen)
+
+        what = "selected" if selected_jobs else "visible"
+        self.app.push_screen(
+            ExportScreen(
+                f"Export {len(jobs)} {what} jobs to a file (.csv, .jsonl or .parquet):",
+                run_export_jobs,
+                f"{self.app.config.job_queue_name}.csv",
+            )
+        )
+
+    @work(thread=True, group="export", exit_on_error=False)
+    def execute_export_jobs(self, jobs: list[dict], path: str, with_details: bool, progress_screen: ProgressScreen):
+        def report_progress(exported: int, total: int):
+            self.app.call_from_thread(progress_screen.update_progress, exported, total)
+
+        start = time.perf_counter()
+        try:
+            exported = export_jobs(self.app.batch_client, jobs, path, with_details, len(jobs), report_progress)
+        except Exception as e:
+            self.app.notify(f"Error exporting jobs: {e}", severity="error")
+            return
+        finally:
+            self.app.call_from_thread(progress_screen.dismiss)
+
+        self.app.notify(
+            f"Exported {exported} jobs to {path} in {time.perf_counter() - start:.1f} s", severity="information"
+        )
+
+    def triage_failures(self):
+        """Group the failed jobs in view (including all failed children of visible array jobs) by failure reason."""
+        job_arns = [
+            job.job["jobArn"] for job in self.visible_jobs if job.bucket is None and job.job["status"] == "FAILED"
+        ]
+        # status buckets stand for all children of an array job with the status, most of them aren't loaded
+        array_jobs = [
+            job.parent_job.job for job in self.visible_jobs if job.bucket is not None and job.bucket.status == "FAILED"
+        ]
+        if not job_arns and not array_jobs:
+            self.app.notify("No failed jobs in view", severity="warning")
+            return
+
+        if self.failure_triage_cache.is_cached(job_arns, array_jobs):
+            failed_jobs = collect_failed_jobs(self.app.batch_client, job_arns, array_jobs, self.failure_triage_cache)
+            self._show_failure_triage(None, failed_jobs)
+            return
+
+        progress_screen = ProgressScreen("Fetching details of failed jobs...")
+        self.app.push_screen(progress_screen)
+        self.execute_failure_triage(job_arns, array_jobs, progress_screen)
+
+    @work(thread=True, group="triage", exit_on_error=False)
+    def execute_failure_triage(self, job_arns: list[str], array_jobs: list[dict], progress_screen: ProgressScreen):
+        def report_progress(done: int, total: int):
+            self.app.call_from_thread(progress_screen.update_progress, done, total)
+
+        try:
+            failed_jobs = collect_failed_jobs(
+                self.app.batch_client, job_arns, array_jobs, self.failure_triage_cache, report_progress
+            )
+        except Exception as e:
+            self.app.call_from_thread(progress_screen.dismiss)
+            self.app.notify(f"Error fetching failed jobs: {e}", severity="error")
+            return
+
+        self.app.call_from_thread(self._show_failure_triage, progress_screen, failed_jobs)
+
+    def _show_failure_triage(self, progress_screen: ProgressScreen | None, failed_jobs: list):
+        if progress_screen is not None:
+            progress_screen.dismiss()
+        if not failed_jobs:
+            self.app.notify("No failed jobs found", severity="warning")
+            return
+
+        self.app.push_screen(FailureTriageScreen(group_failures(failed_jobs), self._on_failure_group_action))
+
+    def _on_failure_group_action(self, action: str, group: FailureGroup):
+        jobs = [failed_job.to_job() for failed_job in group.jobs]
+        description = f"failed ({group.status_reason or 'no reason'})"
+        if action == "kill":
+            self.confirm_kill_jobs(jobs, description)
+        elif action == "resubmit":
+            self.confirm_clone_jobs(jobs, description)
+        elif action == "logs":
+            # the triage already knows the log streams, so no details need to be fetched
+            targets = [
+                LogSearchTarget(
+                    job_id=failed_job.job_id,
+                    job_name=failed_job.job_name,
+                    log_stream_name=failed_job.log_stream_name,
+                    finished=True,
+                )
+                for failed_job in group.jobs
+                if failed_job.log_stream_name
+            ]
+            if not targets:
+                self.app.notify("No logs available", severity="warning")
+                return
+
+            self.confirm_log_search(description, targets=targets)
+
+    def search_selected_logs(self):
+        selected_jobs = self._get_selected_jobs(select_highlighted=True)
+        if selected_jobs is None:
+            return
+
+        self.confirm_log_search("selected", job_arns=[job["jobArn"] for job in selected_jobs])
+
+    def confirm_log_search(
+        self, description: str, job_arns: list[str] | None = None, targets: list[LogSearchTarget] | None = None
+    ):
+        """Ask for a pattern and search the logs of the given jobs.
+
+        Jobs are given either by ARN, with their log streams resolved from the job details, or as `targets` whose
+        log streams are already known.
+        """
+        job_arns = job_arns or []
+        targets = targets or []
+        n_jobs = len(job_arns) + len(targets)
+
+        def run_search_logs(pattern: str):
+            try:
+                regex = re.compile(pattern)
+            except re.error as e:
+                self.app.notify(f"Invalid regular expression: {e}", severity="error")
+                return
+
+            search_screen = LogSearchScreen(pattern, n_jobs)
+            self.app.push_screen(search_screen)
+            self.execute_log_search(job_arns, targets, regex, search_screen)
+
+        self.app.push_screen(
+            TextInputScreen(
+                f"Search the logs of {n_jobs} {description} jobs for (regular expression):", run_search_logs
+            )
+        )
+
+    @work(thread=True, group="log_search", exit_on_error=False)
+    def execute_log_search(
+        self,
+        job_arns: list[str],
+        targets: list[LogSearchTarget],
+        regex: re.Pattern,
+        search_screen: LogSearchScreen,
+    ):
+        # resolve the log streams, only fetching the details which aren't cached yet
+        missing = [job_arn for job_arn in job_arns if self.details_cache.get(job_arn) is None]
+        try:
+            self.details_cache.put_many(get_jobs_details(self.app.batch_client, missing))
+        except Exception as e:
+            self.app.notify(f"Error fetching job details: {e}", severity="error")
+            return
+
+        targets = list(targets)
+        for job_arn in job_arns:
+            job_details = self.details_cache.get(job_arn)
+            if job_details is not None and get_log_stream_name(job_details):
+                targets.append(
+                    LogSearchTarget(
+                        job_id=job_details["jobId"],
+                        job_name=job_details["jobName"],
+                        log_stream_name=get_log_stream_name(job_details),
+                        finished=job_details["status"] in FINAL_STATUSES,
+                    )
+                )
+
+        try:
+            summary = search_logs(
+                self.app.logs_client,
+                targets,
+                regex,
+                on_match=lambda match: self.app.call_from_thread(search_screen.add_match, match),
+                log_cache=self.log_cache,
+                stop_event=search_screen.stop_event,
+            )
+        except Exception as e:
+            self.app.notify(f"Error searching logs: {e}", severity="error")
+            return
+
+        self.app.call_from_thread(search_screen.finish, summary)
 
     def on_data_table_header_selected(self, event: DataTable.HeaderSelected):
         # sort by column that was clicked
-        sort_keys = dict(enumerate(["selected", "jobName", "jobId", "createdAt", "status"]))
-        sort_key = sort_keys[event.column_index]
+        sort_key = COLUMNS[event.column_index][1]
 
         if sort_key == "selected":
             return  # not supported for now
@@ -281,9 +1225,12 @@ class JobTable(DataTable):
             self.sorted_by = sort_key
             self.sort_reversed = False
 
-        self.jobs.sort(key=lambda x: x.job[sort_key], reverse=self.sort_reversed)
+        with metrics.timer("table.sort", key=sort_key):
+            self.jobs.sort(key=lambda x: x.job[sort_key], reverse=self.sort_reversed)
+            self.job_positions = None
         self.redraw_rows()
 
     def update_filter_settings(self, filter_settings: FilterSettings):
         self.filter_settings = filter_settings
+        self.load_missing_time_range()
         self.redraw_rows()
@@ -0,0 +1,75 @@
+import time
+
+from textual.containers import Vertical
+from textual.widgets import Label, Rule, Sparkline, Static
+
+from batchman.lib.stats import QueueStats
+
+STATUSES = ["SUBMITTED", "PENDING", "RUNNABLE", "STARTING", "RUNNING", "SUCCEEDED", "FAILED"]
+HOURS_SHOWN = 24
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+class QueueStatsPanel(Static):
+    """Shows counts by status, jobs per hour and runtimes of the jobs loaded in the job table."""
+
+    REFRESH_INTERVAL = 0.5
+
+    def __init__(self, stats: QueueStats, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.rendered_version = None
+
+    def compose(self):
+        yield Vertical(
+            Label("[b] Stats [/b]"),
+            Rule(),
+            Static(id="status-counts"),
+            Label(f"Jobs per hour (last {HOURS_SHOWN} h)", classes="filter-type-label"),
+            Sparkline([], id="jobs-per-hour"),
+            Label("Runtime", classes="filter-type-label"),
+            Static(id="runtime-stats"),
+            id="stats-vertical",
+        )
+
+    def on_mount(self):
+        self.update_stats()
+        self.set_interval(self.REFRESH_INTERVAL, self.update_stats)
+
+    def update_stats(self):
+        if not self.display or self.stats.version == self.rendered_version:
+            return
+
+        self.rendered_version = self.stats.version
+
+        counts = self.stats.status_counts
+        lines = [f"{status:<10} {counts[status]:>9,}" for status in STATUSES if counts[status] > 0]
+        lines.append(f"{'TOTAL':<10} {self.stats.total:>9,}")
+        self.query_one("#status-counts", Static).update("\n".join(lines))
+
+        self.query_one("#jobs-per-hour", Sparkline).data = self.stats.jobs_per_hour(
+            HOURS_SHOWN, int(time.time() * 1000)
+        )
+
+        self.query_one("#runtime-stats", Static).update(
+            "\n".join(
+                [
+                    f"{'finished':<10} {self.stats.runtime_count:>9,}",
+                    f"{'mean':<10} {format_duration(self.stats.runtime_mean_s):>9}",
+                    f"{'p50':<10} {format_duration(self.stats.runtime_percentile(0.5)):>9}",
+                    f"{'p90':<10} {format_duration(self.stats.runtime_percentile(0.9)):>9}",
+                    f"{'p99':<10} {format_duration(self.stats.runtime_percentile(0.99)):>9}",
+                ]
+            )
+        )
@@ -0,0 +1,359 @@
+"""Local stand-in for the AWS Batch and CloudWatch Logs APIs used by batchman.
+
+Only the calls made from `batchman.lib.batch` are implemented. Jobs are generated deterministically from their
+index on demand, so a queue with a million jobs costs next to nothing until it is paginated.
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from types import SimpleNamespace
+
+import botocore.exceptions
+import botocore.session
+import botocore.validate
+
+REGION = "eu-west-1"
+ACCOUNT_ID = "123456789012"
+LOG_PAGE_SIZE = 10_000
+LIST_JOBS_PAGE_SIZE = 1000
+DESCRIBE_JOBS_LIMIT = 100
+
+# weighted so that a synthetic queue looks like a busy real one
+STATUS_CYCLE = ["SUCCEEDED"] * 10 + ["FAILED"] * 3 + ["RUNNING"] * 3 + ["RUNNABLE"] * 2 + ["PENDING", "STARTING"]
+FINISHED_STATUSES = {"SUCCEEDED", "FAILED"}
+FAILURE_REASONS = [
+    ("Essential container in task exited", 1),
+    ("Essential container in task exited", 137),
+    ("Host EC2 (instance i-0123456789abcdef0) terminated.", None),
+    ("OutOfMemoryError: Container killed due to memory usage", 137),
+]
+
+
+SUBMIT_JOB_INPUT_SHAPE = (
+    botocore.session.get_session().get_service_model("batch").operation_model("SubmitJob").input_shape
+)
+
+
+def job_arn(job_id: str) -> str:
+    return f"arn:aws:batch:{REGION}:{ACCOUNT_ID}:job/{job_id}"
+
+
+def job_id_from_arn(job_id_or_arn: str) -> str:
+    return job_id_or_arn.rsplit("/", 1)[-1]
+
+
+def client_error(code: str, message: str, operation_name: str) -> botocore.exceptions.ClientError:
+    return botocore.exceptions.ClientError({"Error": {"Code": code, "Message": message}}, operation_name)
+
+
+class SyntheticQueue:
+    """A deterministic synthetic job queue.
+
+    Args:
+        n_jobs: number of top-level jobs in the queue
+        n_array_jobs: how many of the top-level jobs are array jobs (spread evenly over the queue)
+        array_size: number of children of each array job
+        log_lines: number of log lines of each job
+        queue_name: name of the job queue
+        start_time: creation time of the oldest job (ms since epoch)
+        interval_ms: time between two consecutive job submissions
+    """
+
+    def __init__(
+        self,
+        n_jobs: int,
+        n_array_jobs: int = 0,
+        array_size: int = 1000,
+        log_lines: int = 1000,
+        queue_name: str = "benchmark",
+        start_time: int | None = None,
+        interval_ms: int = 1000,
+    ):
+        self.n_jobs = n_jobs
+        self.array_size = array_size
+        self.log_lines = log_lines
+        self.queue_name = queue_name
+        self.interval_ms = interval_ms
+        self.start_time = start_time if start_time is not None else int(time.time() * 1000) - n_jobs * interval_ms
+
+        self.array_step = max(1, n_jobs // n_array_jobs) if n_array_jobs else 0
+        self.n_array_jobs = min(n_array_jobs, n_jobs)
+
+        # jobs whose state was changed by the client (e.g. killed), keyed by job ID
+        self.overrides: dict[str, dict] = {}
+
+    #
+    # job generation
+    #
+    def job_id(self, index: int) -> str:
+        return f"{index:08x}-b47c-4a7e-9d3b-{self.n_jobs:012x}"
+
+    def job_index(self, job_id: str) -> int:
+        return int(job_id.split("-", 1)[0], 16)
+
+    def is_array_job(self, index: int) -> bool:
+        return bool(self.array_step) and index % self.array_step == 0 and index // self.array_step < self.n_array_jobs
+
+    def status(self, index: int) -> str:
+        return STATUS_CYCLE[(index * 2654435761) % len(STATUS_CYCLE)]
+
+    def summary(self, index: int) -> dict:
+        job_id = self.job_id(index)
+        created_at = self.start_time + index * self.interval_ms
+        job = {
+            "jobArn": job_arn(job_id),
+            "jobId": job_id,
+            "jobName": f"job-{index:07d}",
+            "createdAt": created_at,
+            "status": self.status(index),
+        }
+
+        if self.is_array_job(index):
+            job["jobName"] = f"array-job-{index:07d}"
+            job["arrayProperties"] = {"size": self.array_size}
+            job["status"] = "RUNNING"
+
+        self._add_timings(job, index)
+        job.update(self.overrides.get(job_id, {}))
+        return job
+
+    def child_summary(self, parent_index: int, child_index: int) -> dict:
+        parent_id = self.job_id(parent_index)
+        job_id = f"{parent_id}:{child_index}"
+        job = {
+            "jobArn": job_arn(job_id),
+            "jobId": job_id,
+            "jobName": f"array-job-{parent_index:07d}",
+            "createdAt": self.start_time + parent_index * self.interval_ms,
+            "status": self.status(parent_index + child_index + 1),
+            "arrayProperties": {"index": child_index},
+        }
+        self._add_timings(job, child_index)
+        job.update(self.overrides.get(job_id, {}))
+        return job
+
+    def _add_timings(self, job: dict, index: int):
+        if job["status"] in FINISHED_STATUSES | {"RUNNING"}:
+            job["startedAt"] = job["createdAt"] + 5_000 + (index % 60) * 1000
+        if job["status"] in FINISHED_STATUSES:
+            job["stoppedAt"] = job["startedAt"] + 60_000 + (index * 7919 % 3600) * 1000
+        if job["status"] == "FAILED":
+            reason, exit_code = FAILURE_REASONS[index % len(FAILURE_REASONS)]
+            job["statusReason"] = reason
+            job["container"] = {"exitCode": exit_code} if exit_code is not None else {}
+
+    def lookup(self, job_id: str) -> dict | None:
+        parent_id, _, child_index = job_id.partition(":")
+        try:
+            index = self.job_index(parent_id)
+        except ValueError:
+            return None
+
+        if index >= self.n_jobs or parent_id != self.job_id(index):
+            return None
+
+        if child_index:
+            if not self.is_array_job(index) or int(child_index) >= self.array_size:
+                return None
+            return self.child_summary(index, int(child_index))
+
+        return self.summary(index)
+
+    def details(self, job_id: str) -> dict | None:
+        job = self.lookup(job_id)
+        if job is None:
+            return None
+
+        job = dict(job)
+        job.update(
+            {
+                "jobQueue": f"arn:aws:batch:{REGION}:{ACCOUNT_ID}:job-queue/{self.queue_name}",
+                "jobDefinition": f"arn:aws:batch:{REGION}:{ACCOUNT_ID}:job-definition/benchmark:1",
+                "parameters": {},
+                "tags": {"origin": "benchmark"},
+                "platformCapabilities": ["EC2"],
+                # the queue uses a fair-share scheduling policy
+                "shareIdentifier": "benchmark",
+                "schedulingPriority": 10,
+            }
+        )
+        container = {
+            "image": "public.ecr.aws/docker/library/busybox:latest",
+            "command": ["sh", "-c", "echo hello"],
+            "environment": [{"name": "BENCHMARK", "value": "1"}],
+            "resourceRequirements": [{"type": "VCPU", "value": "1"}, {"type": "MEMORY", "value": "2048"}],
+            **job.get("container", {}),
+        }
+        if job["status"] in FINISHED_STATUSES | {"RUNNING"}:
+            container["logStreamName"] = f"benchmark/default/{job_id.replace(':', '-')}"
+        job["container"] = container
+
+        if "size" in job.get("arrayProperties", {}):
+            index = self.job_index(job_id)
+            status_summary = Counter(self.status(index + child + 1) for child in range(self.array_size))
+            job["arrayProperties"] = {"size": self.array_size, "statusSummary": dict(status_summary)}
+
+        return job
+
+    #
+    # job listing
+    #
+    def iter_jobs(self, array_job_id: str | None = None, start: int = 0):
+        """Yield (position, job summary) pairs, starting at the given position."""
+        if array_job_id is None:
+            for index in range(start, self.n_jobs):
+                yield index, self.summary(index)
+        else:
+            parent_index = self.job_index(job_id_from_arn(array_job_id))
+            for child_index in range(start, self.array_size):
+                yield child_index, self.child_summary(parent_index, child_index)
+
+
+class FakeBatchClient:
+    """Implements the subset of the boto3 Batch client used by batchman.
+
+    Args:
+        queue: the synthetic queue to serve
+        latency: simulated round-trip time of every call, in seconds
+        max_rps: if set, calls beyond this many per second fail with TooManyRequestsException
+    """
+
+    def __init__(self, queue: SyntheticQueue, latency: float = 0.0, max_rps: int | None = None):
+        self.queue = queue
+        self.latency = latency
+        self.max_rps = max_rps
+        self.calls = Counter()
+        self.submitted = []
+        self.meta = SimpleNamespace(service_model=SimpleNamespace(service_name="batch"))
+        self._recent_calls = deque()
+        self._lock = threading.Lock()
+
+    def _call(self, operation_name: str):
+        with self._lock:
+            self.calls[operation_name] += 1
+            if self.max_rps:
+                now = time.monotonic()
+                while self._recent_calls and self._recent_calls[0] < now - 1:
+                    self._recent_calls.popleft()
+                if len(self._recent_calls) >= self.max_rps:
+                    self.calls["Throttled"] += 1
+                    raise client_error("TooManyRequestsException", "Too Many Requests", operation_name)
+                self._recent_calls.append(now)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+    def list_jobs(
+        self,
+        jobQueue: str | None = None,
+        arrayJobId: str | None = None,
+        jobStatus: str | None = None,
+        filters: list[dict] | None = None,
+        maxResults: int = LIST_JOBS_PAGE_SIZE,
+        nextToken: str | None = None,
+    ) -> dict:
+        self._call("ListJobs")
+        if jobQueue is not None and jobQueue != self.queue.queue_name:
+            raise client_error("ClientException", f"Job queue {jobQueue} does not exist", "ListJobs")
+
+        def matches(job: dict) -> bool:
+            if filters:  # like the real API, the status is ignored when filters are used
+                for job_filter in filters:
+                    value = int(job_filter["values"][0])
+                    if job_filter["name"] == "AFTER_CREATED_AT" and job["createdAt"] <= value:
+                        return False
+                    if job_filter["name"] == "BEFORE_CREATED_AT" and job["createdAt"] >= value:
+                        return False
+                    if job_filter["name"] == "JOB_NAME" and not job["jobName"].startswith(value.rstrip("*")):
+                        return False
+                return True
+
+            return job["status"] == (jobStatus or "RUNNING")
+
+        # the token is simply the position in the (unfiltered) job sequence
+        page = []
+        for position, job in self.queue.iter_jobs(arrayJobId, start=int(nextToken or 0)):
+            if len(page) == maxResults:
+                return {"jobSummaryList": page, "nextToken": str(position)}
+            if matches(job):
+                page.append(job)
+
+        return {"jobSummaryList": page}
+
+    def describe_jobs(self, jobs: list[str]) -> dict:
+        self._call("DescribeJobs")
+        if len(jobs) > DESCRIBE_JOBS_LIMIT:
+            raise client_error("ClientException", "Too many jobs requested", "DescribeJobs")
+
+        details = (self.queue.details(job_id_from_arn(job)) for job in jobs)
+        return {"jobs": [job for job in details if job is not None]}
+
+    def _stop_job(self, operation_name: str, jobId: str, reason: str) -> dict:
+        self._call(operation_name)
+        job = self.queue.lookup(job_id_from_arn(jobId))
+        if job is None:
+            raise client_error("ClientException", f"Job {jobId} not found", operation_name)
+
+        if job["status"] not in FINISHED_STATUSES:
+            self.queue.overrides[job["jobId"]] = {"status": "FAILED", "statusReason": reason}
+        return {}
+
+    def cancel_job(self, jobId: str, reason: str) -> dict:
+        return self._stop_job("CancelJob", jobId, reason)
+
+    def terminate_job(self, jobId: str, reason: str) -> dict:
+        return self._stop_job("TerminateJob", jobId, reason)
+
+    def submit_job(self, jobName: str, jobQueue: str, jobDefinition: str, **kwargs) -> dict:
+        self._call("SubmitJob")
+        # reject requests the real client would reject, e.g. fields of describe_jobs which submit_job doesn't accept
+        botocore.validate.validate_parameters(
+            {"jobName": jobName, "jobQueue": jobQueue, "jobDefinition": jobDefinition, **kwargs},
+            SUBMIT_JOB_INPUT_SHAPE,
+        )
+        with self._lock:
+            job_id = f"c{len(self.submitted):07x}-b47c-4a7e-9d3b-{self.queue.n_jobs:012x}"
+            self.submitted.append({"jobId": job_id, "jobName": jobName, "jobQueue": jobQueue, **kwargs})
+        return {"jobArn": job_arn(job_id), "jobName": jobName, "jobId": job_id}
+
+    def describe_job_queues(self, **kwargs) -> dict:
+        self._call("DescribeJobQueues")
+        return {"jobQueues": [{"jobQueueName": self.queue.queue_name, "state": "ENABLED", "status": "VALID"}]}
+
+
+class FakeLogsClient:
+    """Implements the subset of the boto3 CloudWatch Logs client used by batchman."""
+
+    def __init__(self, queue: SyntheticQueue, latency: float = 0.0):
+        self.queue = queue
+        self.latency = latency
+        self.calls = Counter()
+        self.meta = SimpleNamespace(service_model=SimpleNamespace(service_name="logs"))
+
+    def get_log_events(
+        self,
+        logGroupName: str,
+        logStreamName: str,
+        startFromHead: bool = False,
+        nextToken: str | None = None,
+        limit: int = LOG_PAGE_SIZE,
+    ) -> dict:
+        self.calls["GetLogEvents"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        offset = int(nextToken.split("/")[-1]) if nextToken else 0
+        end = min(offset + limit, self.queue.log_lines)
+        events = [
+            {
+                "timestamp": self.queue.start_time + line,
+                "message": (
+                    f"ERROR line {line}: failed to process item {line} of {logStreamName}"
+                    if line % 997 == 996
+                    else f"INFO line {line}: processed item {line}"
+                ),
+            }
+            for line in range(offset, end)
+        ]
+        return {"events": events, "nextForwardToken": f"f/{end}", "nextBackwardToken": f"b/{offset}"}
@@ -0,0 +1,335 @@
+"""Offline benchmarks of the main batchman flows against a synthetic queue.
+
+Usage:
+    python -m benchmarks.run --jobs 100000 --array-jobs 10 --array-size 50000 --output benchmark_report.json
+
+The AWS clients are replaced by the fakes from `benchmarks.fake_aws`, so no credentials or network access are needed.
+Results are printed as a table and written to a JSON report.
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import platform
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from textual.widgets import Input
+
+import batchman.app
+from batchman.app import BatchmanApp, Config
+from batchman.lib.batch import get_jobs, get_jobs_details, get_log_events, kill_jobs
+from batchman.lib.clone import clone_jobs
+from batchman.lib.export import export_jobs
+from batchman.lib.instrumentation import metrics
+from batchman.lib.log_search import LogSearchTarget, search_logs
+from batchman.lib.throttling import get_rate_limiters, set_rate_limit
+from batchman.widgets.job_table import JobTable
+from benchmarks.fake_aws import FakeBatchClient, FakeLogsClient, SyntheticQueue
+
+
+class BenchmarkApp(BatchmanApp):
+    # CSS paths are resolved relative to the module of the app class
+    CSS_PATH = pathlib.Path(batchman.app.__file__).parent / BatchmanApp.CSS_PATH
+
+    def __init__(self, queue: SyntheticQueue, options: argparse.Namespace, *args, **kwargs):
+        self.queue = queue
+        self.options = options
+        config = Config(job_queue_name=queue.queue_name, region="eu-west-1", display_filter=True)
+        super().__init__(*args, config=config, **kwargs)
+
+    def connect(self):
+        self.batch_client = FakeBatchClient(self.queue, latency=self.options.latency, max_rps=self.options.max_rps)
+        self.logs_client = FakeLogsClient(self.queue, latency=self.options.latency)
+
+
+class Recorder:
+    def __init__(self):
+        self.results = []
+
+    def record(self, flow: str, seconds: float, clients=(), **extra):
+        calls = {}
+        for client in clients:
+            calls.update(client.calls)
+            client.calls.clear()
+
+        self.results.append({"flow": flow, "seconds": round(seconds, 6), "api_calls": calls, **extra})
+        print(f"{flow:<32} {seconds:>10.3f} s  {json.dumps(extra) if extra else ''}", file=sys.stderr)
+
+
+def rate_limiter_stats() -> dict:
+    return {f"limiter.{service}": limiter.to_dict() for service, limiter in get_rate_limiters().items()}
+
+
+def timed(fn, *args, **kwargs) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def run_library_benchmarks(queue: SyntheticQueue, options: argparse.Namespace, recorder: Recorder):
+    """Benchmark `batchman.lib.batch` directly, without the UI."""
+    batch_client = FakeBatchClient(queue, latency=options.latency, max_rps=options.max_rps)
+    logs_client = FakeLogsClient(queue, latency=options.latency)
+
+    seconds, jobs = timed(lambda: list(get_jobs(batch_client, queue.queue_name)))
+    recorder.record("api.list_jobs", seconds, [batch_client], jobs=len(jobs))
+
+    job_arns = [job["jobArn"] for job in jobs[:1000]]
+    seconds, details = timed(get_jobs_details, batch_client, job_arns)
+    recorder.record("api.describe_jobs", seconds, [batch_client], jobs=len(details))
+
+    stream_name = next(d["container"]["logStreamName"] for d in details if "logStreamName" in d["container"])
+    seconds, lines = timed(lambda: sum(1 for _ in get_log_events(logs_client, stream_name)))
+    recorder.record("api.get_log_events", seconds, [logs_client], lines=lines)
+
+    targets = [
+        LogSearchTarget(d["jobId"], d["jobName"], d["container"]["logStreamName"], finished=True)
+        for d in details[:100]
+        if "logStreamName" in d["container"]
+    ]
+    seconds, summary = timed(search_logs, logs_client, targets, re.compile("ERROR"), on_match=lambda match: None)
+    recorder.record(
+        "api.search_logs", seconds, [logs_client], streams=summary.streams_searched, matches=summary.matches
+    )
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        export_path = str(pathlib.Path(export_dir) / "jobs.jsonl")
+        seconds, exported = timed(export_jobs, batch_client, jobs, export_path, with_details=True)
+        recorder.record("api.export_jobs", seconds, [batch_client], jobs=exported, **rate_limiter_stats())
+
+    job_ids = [job["jobId"] for job in jobs[: options.bulk_jobs]]
+    seconds, (cloned, errors) = timed(clone_jobs, batch_client, job_ids, {"jobQueue": queue.queue_name})
+    recorder.record(
+        "api.clone_jobs", seconds, [batch_client], jobs=len(cloned), errors=len(errors), **rate_limiter_stats()
+    )
+
+    seconds, errors = timed(kill_jobs, batch_client, job_ids)
+    recorder.record(
+        "api.kill_jobs", seconds, [batch_client], jobs=len(job_ids), errors=len(errors), **rate_limiter_stats()
+    )
+    queue.overrides.clear()
+
+
+async def wait_until_idle(app: BatchmanApp, pilot):
+    # workers of superseded loads are cancelled, which isn't an error here
+    while not all(worker.is_finished for worker in app.workers):
+        await asyncio.gather(*[worker.wait() for worker in app.workers], return_exceptions=True)
+    await pilot.pause()
+
+
+def select_first_rows(table: JobTable, n_rows: int):
+    table.clear_selection()
+    table.focus()
+    table.move_cursor_to_index(0)
+    table.toggle_selected()
+    table.move_cursor_to_index(min(n_rows, len(table.visible_jobs)) - 1)
+    table.select_range()
+
+
+async def run_ui_benchmarks(queue: SyntheticQueue, options: argparse.Namespace, recorder: Recorder):
+    """Benchmark the main user flows in a headless app."""
+    filter_text = options.filter_text
+    scroll_rows = options.scroll_rows
+    app = BenchmarkApp(queue, options)
+    start = time.perf_counter()
+    async with app.run_test(size=(200, 60)) as pilot:
+        table = app.query_one(JobTable)
+        clients = [app.batch_client, app.logs_client]
+
+        await wait_until_idle(app, pilot)
+        recorder.record("ui.initial_load", time.perf_counter() - start, clients, rows=len(table.visible_jobs))
+
+        start = time.perf_counter()
+        table.refresh_jobs()
+        await wait_until_idle(app, pilot)
+        recorder.record("ui.refresh", time.perf_counter() - start, clients, rows=len(table.visible_jobs))
+
+        # reload again while the previous load is still paginating; the stale load must stop and not add any rows
+        start = time.perf_counter()
+        table.refresh_jobs()
+        await pilot.pause(0.05)
+        table.refresh_jobs()
+        await wait_until_idle(app, pilot)
+        recorder.record("ui.refresh_during_load", time.perf_counter() - start, clients, rows=len(table.visible_jobs))
+
+        # type the filter one key at a time, like a user would
+        app.query_one("#job_name_filter", Input).focus()
+        start = time.perf_counter()
+        for char in filter_text:
+            await pilot.press(char)
+        await pilot.pause()
+        recorder.record(
+            "ui.filter_typing",
+            time.perf_counter() - start,
+            clients,
+            keys=len(filter_text),
+            rows=len(table.visible_jobs),
+        )
+
+        app.query_one("#job_name_filter", Input).value = ""
+        await pilot.pause()
+        table.focus()
+
+        for column_index, column in [(1, "jobName"), (3, "createdAt"), (4, "status")]:
+            start = time.perf_counter()
+            table.on_data_table_header_selected(SimpleNamespace(column_index=column_index))
+            await pilot.pause()
+            recorder.record(f"ui.sort.{column}", time.perf_counter() - start, clients, rows=len(table.visible_jobs))
+
+        array_rows = [index for index, job in enumerate(table.jobs) if job.is_array_job and job.parent_job is None]
+        if array_rows:
+            table.move_cursor_to_index(array_rows[0])
+            start = time.perf_counter()
+            table.toggle_expand_array_job()
+            await wait_until_idle(app, pilot)
+            recorder.record("ui.expand_array_job", time.perf_counter() - start, clients, rows=len(table.visible_jobs))
+
+            # open the first status bucket and scroll through the children, loading them window by window
+            table.move_cursor_to_index(array_rows[0] + 1)
+            start = time.perf_counter()
+            table.toggle_expand_array_job()
+            await wait_until_idle(app, pilot)
+            recorder.record(
+                "ui.expand_array_bucket", time.perf_counter() - start, clients, rows=len(table.visible_jobs)
+            )
+
+            start = time.perf_counter()
+            for _ in range(scroll_rows):
+                await pilot.press("down")
+            await wait_until_idle(app, pilot)
+            recorder.record(
+                "ui.scroll_array_children",
+                time.perf_counter() - start,
+                clients,
+                keys=scroll_rows,
+                rows=len(table.visible_jobs),
+            )
+
+            table.move_cursor_to_index(array_rows[0])
+            start = time.perf_counter()
+            table.toggle_expand_array_job()
+            await wait_until_idle(app, pilot)
+            recorder.record("ui.collapse_array_job", time.perf_counter() - start, clients, rows=len(table.visible_jobs))
+
+        # move through the table like a user would; details around the cursor are prefetched in batches
+        table.focus()
+        table.move_cursor_to_index(0)
+        start = time.perf_counter()
+        for _ in range(scroll_rows):
+            await pilot.press("down")
+            await pilot.pause(0.2)
+        await wait_until_idle(app, pilot)
+        recorder.record("ui.scroll_table", time.perf_counter() - start, clients, keys=scroll_rows)
+
+        # page through the table and jump to its end; only the rows around the viewport are materialized
+        page_keys = scroll_rows // 10
+        table.move_cursor_to_index(0)
+        start = time.perf_counter()
+        for _ in range(page_keys):
+            await pilot.press("pagedown")
+        await pilot.press("ctrl+end")
+        await pilot.pause()
+        recorder.record(
+            "ui.page_table", time.perf_counter() - start, clients, keys=page_keys + 1, rows=len(table.visible_jobs)
+        )
+
+        log_rows = [index for index, job in enumerate(table.jobs) if job.job["status"] in ("SUCCEEDED", "FAILED")]
+        if log_rows:
+            table.move_cursor_to_index(log_rows[0])
+            await pilot.pause(0.2)
+            await wait_until_idle(app, pilot)  # let the details prefetch finish
+            start = time.perf_counter()
+            table.view_job_logs()
+            await wait_until_idle(app, pilot)
+            recorder.record("ui.open_logs", time.perf_counter() - start, clients, lines=queue.log_lines)
+            app.pop_screen()
+            await pilot.pause()
+
+        start = time.perf_counter()
+        table.select_all()
+        await pilot.pause()
+        recorder.record("ui.select_all", time.perf_counter() - start, clients, rows=len(table.visible_jobs))
+
+        select_first_rows(table, options.bulk_jobs)
+        start = time.perf_counter()
+        table.clone_selected_jobs()
+        await pilot.pause()
+        await pilot.press("enter")  # submit the (empty) overrides
+        await wait_until_idle(app, pilot)
+        recorder.record(
+            "ui.bulk_clone", time.perf_counter() - start, clients, jobs=options.bulk_jobs, **rate_limiter_stats()
+        )
+        app.pop_screen()  # clone report
+        await wait_until_idle(app, pilot)
+
+        select_first_rows(table, options.bulk_jobs)
+        start = time.perf_counter()
+        table.kill_selected_jobs()
+        await pilot.pause()
+        await pilot.press("enter")  # confirm
+        await wait_until_idle(app, pilot)
+        recorder.record(
+            "ui.bulk_kill", time.perf_counter() - start, clients, jobs=options.bulk_jobs, **rate_limiter_stats()
+        )
+
+        app.exit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10_000, help="number of top-level jobs in the queue")
+    parser.add_argument("--array-jobs", type=int, default=5, help="number of array jobs among them")
+    parser.add_argument("--array-size", type=int, default=10_000, help="number of children of each array job")
+    parser.add_argument("--log-lines", type=int, default=100_000, help="number of log lines of each job")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated latency of every AWS call (seconds)")
+    parser.add_argument("--filter-text", default="job-00012", help="text typed into the job name filter")
+    parser.add_argument("--max-rps", type=int, default=None, help="throttle the fake Batch API above this rate")
+    parser.add_argument("--batch-rate", type=float, default=None, help="override the client-side Batch rate limit")
+    parser.add_argument("--bulk-jobs", type=int, default=500, help="number of jobs killed/cloned in the bulk flows")
+    parser.add_argument("--scroll-rows", type=int, default=300, help="rows scrolled through an expanded array job")
+    parser.add_argument("--instrument", action="store_true", help="collect batchman metrics and add them to the report")
+    parser.add_argument("--skip-ui", action="store_true", help="only benchmark the library calls")
+    parser.add_argument("--output", default="benchmark_report.json", help="path of the JSON report")
+    args = parser.parse_args()
+
+    queue = SyntheticQueue(
+        n_jobs=args.jobs,
+        n_array_jobs=args.array_jobs,
+        array_size=args.array_size,
+        log_lines=args.log_lines,
+    )
+
+    if args.instrument:
+        metrics.enable()
+
+    if args.batch_rate:
+        set_rate_limit("batch", args.batch_rate, int(args.batch_rate))
+
+    recorder = Recorder()
+    run_library_benchmarks(queue, args, recorder)
+    if not args.skip_ui:
+        asyncio.run(run_ui_benchmarks(queue, args, recorder))
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": vars(args),
+        "results": recorder.results,
+    }
+    if args.instrument:
+        report["metrics"] = metrics.snapshot()
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Report written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()